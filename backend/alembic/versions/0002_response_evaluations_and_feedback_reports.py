@@ -0,0 +1,55 @@
+"""response evaluation state and stored feedback reports
+
+Revision ID: 0002_evaluations_reports
+Revises: 0001_initial_schema
+Create Date: 2026-10-18 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_evaluations_reports'
+down_revision: Union[str, None] = '0001_initial_schema'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Tables and columns may already exist where the app created the schema at startup
+    inspector = sa.inspect(op.get_bind())
+    columns = {c['name'] for c in inspector.get_columns('responses')}
+    if 'suggestions' not in columns:
+        op.add_column('responses', sa.Column('suggestions', sa.JSON(), nullable=True))
+    if 'evaluation_status' not in columns:
+        op.add_column('responses', sa.Column('evaluation_status', sa.String(), nullable=True))
+        op.execute("UPDATE responses SET evaluation_status = 'completed'")
+    
+    if inspector.has_table('feedback_reports'):
+        return
+    op.create_table(
+        'feedback_reports',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('interview_id', sa.Integer(), nullable=True),
+        sa.Column('overall_score', sa.Float(), nullable=True),
+        sa.Column('summary', sa.Text(), nullable=True),
+        sa.Column('strengths', sa.JSON(), nullable=True),
+        sa.Column('improvements', sa.JSON(), nullable=True),
+        sa.Column('recommendations', sa.JSON(), nullable=True),
+        sa.Column('responses_fingerprint', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['interview_id'], ['interviews.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('interview_id')
+    )
+    op.create_index(op.f('ix_feedback_reports_id'), 'feedback_reports', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_feedback_reports_id'), table_name='feedback_reports')
+    op.drop_table('feedback_reports')
+    op.drop_column('responses', 'evaluation_status')
+    op.drop_column('responses', 'suggestions')
@@ -0,0 +1,42 @@
+"""composite indexes for interview history and per-interview lookups
+
+Revision ID: 0003_lookup_indexes
+Revises: 0002_evaluations_reports
+Create Date: 2026-10-18 09:20:00.000000
+
+On PostgreSQL the indexes are built CONCURRENTLY so large tables stay
+writable while the migration runs.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003_lookup_indexes'
+down_revision: Union[str, None] = '0002_evaluations_reports'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_interviews_user_id_created_at', 'interviews', ['user_id', 'created_at']),
+    ('ix_questions_interview_id_order_index', 'questions', ['interview_id', 'order_index']),
+    ('ix_responses_interview_id', 'responses', ['interview_id']),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    existing = {index['name'] for table in {t for _, t, _ in INDEXES} for index in inspector.get_indexes(table)}
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            if name in existing:
+                continue
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,28 @@
+"""running summary of evaluated answers on interviews
+
+Revision ID: 0004_running_summary
+Revises: 0003_lookup_indexes
+Create Date: 2026-10-18 14:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004_running_summary'
+down_revision: Union[str, None] = '0003_lookup_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The column may already exist where the app created the schema at startup
+    if 'running_summary' not in {c['name'] for c in sa.inspect(op.get_bind()).get_columns('interviews')}:
+        op.add_column('interviews', sa.Column('running_summary', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('interviews', 'running_summary')
@@ -0,0 +1,28 @@
+"""question generation status on interviews
+
+Revision ID: 0005_question_status
+Revises: 0004_running_summary
+Create Date: 2026-10-18 16:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005_question_status'
+down_revision: Union[str, None] = '0004_running_summary'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The column may already exist where the app created the schema at startup
+    if 'question_status' not in {c['name'] for c in sa.inspect(op.get_bind()).get_columns('interviews')}:
+        op.add_column('interviews', sa.Column('question_status', sa.String(), nullable=True, server_default='ready'))
+
+
+def downgrade() -> None:
+    op.drop_column('interviews', 'question_status')
@@ -0,0 +1,58 @@
+"""idempotency keys and one response per question
+
+Revision ID: 0006_idempotency
+Revises: 0005_question_status
+Create Date: 2026-10-18 18:05:00.000000
+
+Duplicate responses left by client retries are removed before the unique
+index is built, keeping the first answer to each question. On PostgreSQL
+the index is built CONCURRENTLY so the table stays writable.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006_idempotency'
+down_revision: Union[str, None] = '0005_question_status'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Tables and indexes may already exist where the app created the schema at startup
+    inspector = sa.inspect(op.get_bind())
+    indexes = {index['name'] for index in inspector.get_indexes('responses')}
+    if not inspector.has_table('idempotency_keys'):
+        op.create_table(
+            'idempotency_keys',
+            sa.Column('scope', sa.String(), nullable=False),
+            sa.Column('key', sa.String(), nullable=False),
+            sa.Column('request_hash', sa.String(), nullable=True),
+            sa.Column('status', sa.String(), nullable=True),
+            sa.Column('response_body', sa.JSON(), nullable=True),
+            sa.Column('expires_at', sa.Float(), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.PrimaryKeyConstraint('scope', 'key')
+        )
+    op.execute(
+        "DELETE FROM responses WHERE id NOT IN "
+        "(SELECT MIN(id) FROM responses GROUP BY interview_id, question_id)"
+    )
+    with op.get_context().autocommit_block():
+        if 'uq_responses_interview_id_question_id' not in indexes:
+            op.create_index(
+                'uq_responses_interview_id_question_id', 'responses', ['interview_id', 'question_id'],
+                unique=True, postgresql_concurrently=True
+            )
+        if 'ix_responses_interview_id' in indexes:
+            op.drop_index('ix_responses_interview_id', table_name='responses', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_responses_interview_id', 'responses', ['interview_id'], unique=False, postgresql_concurrently=True)
+        op.drop_index('uq_responses_interview_id_question_id', table_name='responses', postgresql_concurrently=True)
+    op.drop_table('idempotency_keys')
@@ -0,0 +1,34 @@
+"""index idempotency keys by expiry
+
+Revision ID: 0007_idempotency_expiry
+Revises: 0006_idempotency
+Create Date: 2026-10-18 21:10:00.000000
+
+Lets workers delete expired keys without scanning the table.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007_idempotency_expiry'
+down_revision: Union[str, None] = '0006_idempotency'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The index may already exist where the app created the schema at startup
+    if 'ix_idempotency_keys_expires_at' not in {i['name'] for i in sa.inspect(op.get_bind()).get_indexes('idempotency_keys')}:
+        with op.get_context().autocommit_block():
+            op.create_index(
+                'ix_idempotency_keys_expires_at', 'idempotency_keys', ['expires_at'],
+                unique=False, postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_idempotency_keys_expires_at', table_name='idempotency_keys', postgresql_concurrently=True)
@@ -0,0 +1,40 @@
+"""last-change timestamp on interviews
+
+Revision ID: 0008_interview_updated_at
+Revises: 0007_idempotency_expiry
+Create Date: 2026-10-18 21:40:00.000000
+
+Existing interviews are stamped with the migration time, so the next
+incremental export picks each of them up once.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008_interview_updated_at'
+down_revision: Union[str, None] = '0007_idempotency_expiry'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The column and index may already exist where the app created the schema at startup
+    inspector = sa.inspect(op.get_bind())
+    if 'updated_at' not in {c['name'] for c in inspector.get_columns('interviews')}:
+        op.add_column('interviews', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+        op.execute("UPDATE interviews SET updated_at = CURRENT_TIMESTAMP")
+    if 'ix_interviews_updated_at' not in {i['name'] for i in inspector.get_indexes('interviews')}:
+        with op.get_context().autocommit_block():
+            op.create_index(
+                'ix_interviews_updated_at', 'interviews', ['updated_at'],
+                unique=False, postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_interviews_updated_at', table_name='interviews', postgresql_concurrently=True)
+    op.drop_column('interviews', 'updated_at')
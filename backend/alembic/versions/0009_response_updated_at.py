@@ -0,0 +1,40 @@
+"""last-change timestamp on responses
+
+Revision ID: 0009_response_updated_at
+Revises: 0008_interview_updated_at
+Create Date: 2026-10-19 10:20:00.000000
+
+Responses are stamped with their creation time: changes made before this
+revision were already recorded on their interview.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009_response_updated_at'
+down_revision: Union[str, None] = '0008_interview_updated_at'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The column and index may already exist where the app created the schema at startup
+    inspector = sa.inspect(op.get_bind())
+    if 'updated_at' not in {c['name'] for c in inspector.get_columns('responses')}:
+        op.add_column('responses', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+        op.execute("UPDATE responses SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP)")
+    if 'ix_responses_updated_at' not in {i['name'] for i in inspector.get_indexes('responses')}:
+        with op.get_context().autocommit_block():
+            op.create_index(
+                'ix_responses_updated_at', 'responses', ['updated_at'],
+                unique=False, postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_responses_updated_at', table_name='responses', postgresql_concurrently=True)
+    op.drop_column('responses', 'updated_at')
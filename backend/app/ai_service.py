@@ -1,19 +1,296 @@
 
+import asyncio
 import json
-import openai
-from typing import List, Dict, Any
+import random
+import time
+from fastapi.concurrency import run_in_threadpool
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Callable, List, Dict, Any, Optional, Tuple
 from .config import settings
+from .cache import content_key, question_cache
+from .interview_summary import format_summary
+from .prescorer import insufficient_evaluation, prescorer
+from .singleflight import question_flight
+from .llm_scheduler import Priority, estimate_tokens, llm_scheduler
+from .metrics import record_llm_call
 
-# Configure OpenAI
-openai.api_key = settings.openai_api_key
+# Bump whenever the question prompt changes so cached question sets are not reused
+QUESTION_PROMPT_VERSION = "1"
+
+QUESTION_SYSTEM_PROMPT = "You are an expert HR professional and technical interviewer."
+
+# Feedback fields forwarded to streaming clients as they are generated
+STREAMED_FEEDBACK_FIELDS = ("overall_score", "summary", "strengths", "improvements", "recommendations")
+
+if TYPE_CHECKING:
+    import numpy as np
+    import openai
+
+
+def _retryable_errors() -> Tuple[type, ...]:
+    """Transient failures worth retrying: network errors, timeouts, throttling and 5xx"""
+    import openai
+    return (
+        openai.APIConnectionError,
+        openai.RateLimitError,
+        openai.InternalServerError,
+    )
 
 
 class AIService:
     def __init__(self):
-        self.client = openai.OpenAI(api_key=settings.openai_api_key)
+        # The OpenAI SDK and its HTTP stack are slow to import, so they load with the first service
+        import httpx
+        import openai
+        
+        # One pooled HTTP transport shared by every LLM call in this process
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.openai_max_connections,
+                max_keepalive_connections=settings.openai_max_keepalive_connections
+            ),
+            timeout=httpx.Timeout(settings.openai_timeout, connect=settings.openai_connect_timeout)
+        )
+        self.client = openai.AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            http_client=self.http_client,
+            max_retries=0  # retries are handled in _chat_completion
+        )
+        self.retryable_errors = _retryable_errors()
+        self.rate_limit_error = openai.RateLimitError
+    
+    async def aclose(self):
+        """Close the pooled HTTP connections"""
+        await self.http_client.aclose()
+    
+    async def _chat_completion(self, system_prompt: str, prompt: str, temperature: float, max_tokens: int, priority: Priority, operation: str) -> str:
+        """Run a chat completion through the scheduler, retrying transient errors with exponential backoff"""
+        
+        # The API counts max_tokens against the tokens-per-minute limit up front
+        estimated = estimate_tokens(system_prompt, prompt) + max_tokens
+        attempt = 0
+        while True:
+            try:
+                async with llm_scheduler.slot(priority, estimated) as grant:
+                    started = time.perf_counter()
+                    try:
+                        response = await self.client.chat.completions.create(
+                            model=settings.openai_model,
+                            messages=[
+                                {"role": "system", "content": system_prompt},
+                                {"role": "user", "content": prompt}
+                            ],
+                            temperature=temperature,
+                            max_tokens=max_tokens
+                        )
+                    except Exception as e:
+                        record_llm_call(operation, time.perf_counter() - started, error=e)
+                        if isinstance(e, self.rate_limit_error):
+                            llm_scheduler.on_rate_limited(_retry_after(e))
+                        raise
+                    record_llm_call(operation, time.perf_counter() - started, usage=response.usage)
+                    if response.usage:
+                        grant.used_tokens = response.usage.total_tokens
+                return response.choices[0].message.content or ""
+            except self.retryable_errors:
+                if attempt >= settings.openai_max_retries:
+                    raise
+                delay = min(settings.openai_retry_backoff * (2 ** attempt), settings.openai_retry_backoff_max)
+                # Full jitter so retries from many requests don't arrive together
+                await asyncio.sleep(random.uniform(0, delay))
+                attempt += 1
+    
+    async def _chat_completion_stream(self, system_prompt: str, prompt: str, temperature: float, max_tokens: int, priority: Priority, operation: str) -> AsyncIterator[str]:
+        """Stream a chat completion as text deltas, holding a scheduler slot until the stream ends
+        
+        Transient errors are retried with backoff only until the first token arrives.
+        """
+        
+        estimated = estimate_tokens(system_prompt, prompt) + max_tokens
+        attempt = 0
+        while True:
+            received = False
+            try:
+                async with llm_scheduler.slot(priority, estimated):
+                    started = time.perf_counter()
+                    try:
+                        stream = await self.client.chat.completions.create(
+                            model=settings.openai_model,
+                            messages=[
+                                {"role": "system", "content": system_prompt},
+                                {"role": "user", "content": prompt}
+                            ],
+                            temperature=temperature,
+                            max_tokens=max_tokens,
+                            stream=True
+                        )
+                        async for chunk in stream:
+                            if chunk.choices and chunk.choices[0].delta.content:
+                                received = True
+                                yield chunk.choices[0].delta.content
+                    except Exception as e:
+                        record_llm_call(operation, time.perf_counter() - started, error=e)
+                        if isinstance(e, self.rate_limit_error):
+                            llm_scheduler.on_rate_limited(_retry_after(e))
+                        raise
+                    # Streamed responses carry no usage, so only latency is recorded
+                    record_llm_call(operation, time.perf_counter() - started)
+                return
+            except self.retryable_errors:
+                if received or attempt >= settings.openai_max_retries:
+                    raise
+                delay = min(settings.openai_retry_backoff * (2 ** attempt), settings.openai_retry_backoff_max)
+                await asyncio.sleep(random.uniform(0, delay))
+                attempt += 1
+    
+    @staticmethod
+    def _parse_json(content: str) -> Any:
+        """Parse a JSON payload from a completion, tolerating markdown code fences"""
+        content = content.strip()
+        if content.startswith("```"):
+            content = content.split("\n", 1)[1] if "\n" in content else ""
+            content = content.rsplit("```", 1)[0]
+        return json.loads(content)
+    
+    async def generate_interview_questions(self, job_description: str, job_title: str) -> List[Dict[str, Any]]:
+        """Generate interview questions, serving repeated job postings from the cache"""
+        
+        key = content_key(QUESTION_PROMPT_VERSION, job_title, job_description)
+        if settings.question_cache_enabled:
+            cached = await question_cache.get(key)
+            if cached is not None:
+                return cached
+        
+        # Concurrent requests for the same posting share a single generation
+        try:
+            return await question_flight.do(key, lambda: self._generate_and_cache_questions(key, job_description, job_title))
+        except Exception as e:
+            print(f"Error generating questions: {e}")
+            return []
+    
+    async def stream_interview_questions(
+        self,
+        job_description: str,
+        job_title: str,
+        on_questions: Callable[[List[Dict[str, Any]]], Awaitable[None]]
+    ) -> List[Dict[str, Any]]:
+        """Generate interview questions, handing them to on_questions as soon as they exist
+        
+        A fresh generation is streamed from the LLM and each question is passed on
+        the moment it is parsed. Cached, reused and coalesced question sets are
+        passed on in one call. Returns every question passed on.
+        """
+        
+        delivered: List[Dict[str, Any]] = []
+        
+        async def deliver(questions: List[Dict[str, Any]]):
+            await on_questions(questions)
+            delivered.extend(questions)
+        
+        key = content_key(QUESTION_PROMPT_VERSION, job_title, job_description)
+        questions = await question_cache.get(key) if settings.question_cache_enabled else None
+        if questions is None:
+            try:
+                questions = await question_flight.do(
+                    key, lambda: self._generate_and_cache_questions(key, job_description, job_title, on_question=deliver)
+                )
+            except Exception as e:
+                print(f"Error generating questions: {e}")
+                questions = []
+        
+        # Whatever was not streamed: a cache or bank hit, or the result of another request's generation
+        if len(questions) > len(delivered):
+            await deliver(questions[len(delivered):])
+        return delivered
+    
+    async def _generate_and_cache_questions(
+        self,
+        key: str,
+        job_description: str,
+        job_title: str,
+        on_question: Optional[Callable[[List[Dict[str, Any]]], Awaitable[None]]] = None
+    ) -> List[Dict[str, Any]]:
+        questions = await self._reuse_or_generate_questions(job_description, job_title, on_question)
+        if not questions:
+            # Raised rather than returned so the failure is not handed to other workers
+            raise RuntimeError("no questions were generated")
+        # Without the LLM these are placeholders or a loose bank match: don't let them outlive the outage
+        if settings.question_cache_enabled and settings.openai_enabled:
+            await question_cache.set(key, questions)
+        return questions
+    
+    async def _embed_job(self, job_description: str, job_title: str) -> Optional["np.ndarray"]:
+        """Embed a job posting for the question bank, or None if no embedder is available"""
+        text = f"{job_title}\n{job_title}\n{job_description}"  # title counted twice to weigh it up
+        if settings.question_bank_embedder == "openai":
+            if not settings.openai_enabled:
+                return None
+            async with llm_scheduler.slot(Priority.STANDARD, estimate_tokens(text)) as grant:
+                started = time.perf_counter()
+                try:
+                    result = await self.client.embeddings.create(
+                        model=settings.embedding_model,
+                        input=text,
+                        dimensions=settings.question_bank_dim
+                    )
+                except Exception as e:
+                    record_llm_call("embed_job", time.perf_counter() - started, error=e)
+                    raise
+                record_llm_call("embed_job", time.perf_counter() - started, usage=result.usage)
+                grant.used_tokens = result.usage.total_tokens
+            import numpy as np
+            return np.asarray(result.data[0].embedding, dtype=np.float32)
+        
+        from .question_bank import hashing_embedder
+        return hashing_embedder.embed(text)
+    
+    async def _reuse_or_generate_questions(
+        self,
+        job_description: str,
+        job_title: str,
+        on_question: Optional[Callable[[List[Dict[str, Any]]], Awaitable[None]]] = None
+    ) -> List[Dict[str, Any]]:
+        """Reuse a question set from a similar job posting, generating a new one otherwise"""
+        
+        if not settings.question_bank_enabled:
+            return await self._generate_interview_questions(job_description, job_title, on_question)
+        
+        # Deferred: NumPy is only needed once the bank is used
+        from .question_bank import question_bank, reshuffle
+        
+        try:
+            vector = await self._embed_job(job_description, job_title)
+        except Exception as e:
+            print(f"Error embedding job description: {e}")
+            vector = None
+        if vector is None:
+            return await self._generate_interview_questions(job_description, job_title, on_question)
+        
+        # Without the LLM any reasonably close bank entry beats the placeholder questions
+        threshold = settings.question_bank_threshold if settings.openai_enabled else settings.question_bank_fallback_threshold
+        match = await run_in_threadpool(question_bank.find, vector, threshold, QUESTION_PROMPT_VERSION)
+        if match is not None:
+            _, questions = match
+            return reshuffle(questions) if settings.question_bank_shuffle else questions
+        
+        questions = await self._generate_interview_questions(job_description, job_title, on_question)
+        if questions and settings.openai_enabled:
+            try:
+                await run_in_threadpool(question_bank.add, vector, job_title, questions, QUESTION_PROMPT_VERSION)
+            except Exception as e:
+                print(f"Error adding questions to the question bank: {e}")
+        return questions
     
-    def generate_interview_questions(self, job_description: str, job_title: str) -> List[Dict[str, Any]]:
-        """Generate interview questions based on job description"""
+    async def _generate_interview_questions(
+        self,
+        job_description: str,
+        job_title: str,
+        on_question: Optional[Callable[[List[Dict[str, Any]]], Awaitable[None]]] = None
+    ) -> List[Dict[str, Any]]:
+        """Generate interview questions based on job description
+        
+        With on_question, the completion is streamed and each question is passed
+        to it as soon as it is parsed.
+        """
         
         prompt = f"""
         Based on this job description for a {job_title} role, generate a mock interview with 8 questions.
@@ -34,24 +311,23 @@ class AIService:
         """
         
         try:
-            '''enable this when you want to use the openai api'''
-            # response = self.client.chat.completions.create(
-            #     model="gpt-4",
-            #     messages=[
-            #         {"role": "system", "content": "You are an expert HR professional and technical interviewer."},
-            #         {"role": "user", "content": prompt}
-            #     ],
-            #     temperature=0.7,
-            #     max_tokens=1000
-            # )
+            if settings.openai_enabled and on_question is not None:
+                return await self._stream_questions(prompt, on_question)
             
-            # Parse the response and extract questions
-            # content = response.choices[0].message.content
-            '''enable this when you want to use the openai api'''
-
-            # You might need to add JSON parsing logic here
-            # For now, returning a structured format
+            if settings.openai_enabled:
+                content = await self._chat_completion(
+                    QUESTION_SYSTEM_PROMPT,
+                    prompt,
+                    temperature=0.7,
+                    max_tokens=1000,
+                    priority=Priority.STANDARD,
+                    operation="generate_interview_questions"
+                )
+                
+                # Parse the response and extract questions
+                return self._questions_from_json(content)
             
+            # Placeholder questions while the OpenAI API is disabled
             questions = [
                 {
                     "question_text": "Tell me about a challenging project you worked on and how you overcame obstacles.",
@@ -80,6 +356,56 @@ class AIService:
             print(f"Error generating questions: {e}")
             return []
     
+    async def _stream_questions(self, prompt: str, on_question: Callable[[List[Dict[str, Any]]], Awaitable[None]]) -> List[Dict[str, Any]]:
+        """Stream the question array, passing each question on the moment its object is complete"""
+        
+        parser = JSONArrayStream()
+        content: List[str] = []
+        questions: List[Dict[str, Any]] = []
+        async for delta in self._chat_completion_stream(
+            QUESTION_SYSTEM_PROMPT,
+            prompt,
+            temperature=0.7,
+            max_tokens=1000,
+            priority=Priority.STANDARD,
+            operation="generate_interview_questions"
+        ):
+            content.append(delta)
+            for item in parser.feed(delta):
+                if not isinstance(item, dict) or "question_text" not in item:
+                    print(f"Skipping streamed item that is not a question: {str(item)[:80]}")
+                    continue
+                # Numbered in arrival order, so a question can never land before one already served
+                question = {
+                    "question_text": str(item["question_text"]),
+                    "question_type": str(item.get("question_type", "general")),
+                    "order_index": len(questions) + 1
+                }
+                await on_question([question])
+                questions.append(question)
+        
+        if not questions:
+            # The incremental parser found no question array: fall back to parsing the whole completion
+            questions = self._questions_from_json("".join(content))
+            if not questions:
+                raise ValueError("the completion contained no questions")
+            await on_question(questions)
+        return questions
+    
+    def _questions_from_json(self, content: str) -> List[Dict[str, Any]]:
+        """Extract the questions from a complete question generation"""
+        parsed = self._parse_json(content)
+        if isinstance(parsed, dict):
+            parsed = parsed.get("questions", [])
+        return [
+            {
+                "question_text": str(q["question_text"]),
+                "question_type": str(q.get("question_type", "general")),
+                "order_index": int(q.get("order_index", i + 1))
+            }
+            for i, q in enumerate(parsed)
+        ]
+    
     def _generate_technical_questions(self, job_title: str, job_description: str) -> List[Dict[str, Any]]:
         """Generate technical questions based on job title and description"""
         
@@ -146,8 +472,37 @@ class AIService:
         
         return technical_questions
     
-    def evaluate_response(self, question: str, response: str, question_type: str) -> Dict[str, Any]:
-        """Evaluate a user's response and provide feedback"""
+    async def prescore_response(self, question: str, response: str, job_description: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Score a response locally, or None when the pre-scorer is disabled or failed"""
+        if not settings.prescore_enabled:
+            return None
+        try:
+            return await prescorer.score(question, response, job_description)
+        except Exception as e:
+            print(f"Error pre-scoring response: {e}")
+            return None
+    
+    async def evaluate_response(
+        self,
+        question: str,
+        response: str,
+        question_type: str,
+        job_description: Optional[str] = None,
+        prescore: bool = True,
+        raise_errors: bool = False
+    ) -> Dict[str, Any]:
+        """Evaluate a user's response and provide feedback
+        
+        Deferred evaluations pass prescore=False, since the answer was pre-scored
+        when it was submitted, and raise_errors=True, so a failed LLM call is
+        recorded and retried rather than stored as the placeholder evaluation.
+        """
+        
+        # Answers the local pre-scorer rejects outright never reach the LLM
+        result = await self.prescore_response(question, response, job_description) if prescore else None
+        if result and result["insufficient"]:
+            prescorer.record_llm_avoided()
+            return insufficient_evaluation(result)
         
         prompt = f"""
         As an expert interviewer, evaluate this response to the following question:
@@ -160,26 +515,30 @@ class AIService:
         1. A score from 1-10 (where 10 is excellent)
         2. Constructive feedback highlighting strengths and areas for improvement
         3. Specific suggestions for better responses
+        4. A note of at most 20 words with the key takeaway about this answer
         
-        Format your response as JSON with keys: score, feedback, suggestions
+        Format your response as JSON with keys: score, feedback, suggestions, note
         """
         
         try:
-            '''enable this when you want to use the openai api'''
-            # response_ai = self.client.chat.completions.create(
-            #     model="gpt-4",
-            #     messages=[
-            #         {"role": "system", "content": "You are an expert interviewer providing constructive feedback."},
-            #         {"role": "user", "content": prompt}
-            #     ],
-            #     temperature=0.5,
-            #     max_tokens=500
-            # )
-            # content = response_ai.choices[0].message.content
-            '''enable this when you want to use the openai api'''
+            if settings.openai_enabled:
+                content = await self._chat_completion(
+                    "You are an expert interviewer providing constructive feedback.",
+                    prompt,
+                    temperature=0.5,
+                    max_tokens=500,
+                    priority=Priority.INTERACTIVE,
+                    operation="evaluate_response"
+                )
+                parsed = self._parse_json(content)
+                return {
+                    "score": float(parsed["score"]),
+                    "feedback": str(parsed.get("feedback", "")),
+                    "suggestions": list(parsed.get("suggestions", [])),
+                    "note": str(parsed.get("note", ""))
+                }
             
-            # For now, return a structured response
-            # In production, you'd parse the JSON response
+            # Placeholder evaluation while the OpenAI API is disabled
             return {
                 "score": 7.5,  # Placeholder score
                 "feedback": "Good response with room for improvement. Consider providing more specific examples.",
@@ -191,6 +550,8 @@ class AIService:
             }
             
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"Error evaluating response: {e}")
             return {
                 "score": 5.0,
@@ -198,14 +559,13 @@ class AIService:
                 "suggestions": []
             }
     
-    def generate_interview_feedback(self, interview_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate overall interview feedback"""
-        
-        prompt = f"""
-        Based on this interview data, provide comprehensive feedback:
+    def _feedback_prompt(self, interview_data: Dict[str, Any]) -> str:
+        # Built from the bounded running summary, not the full transcript
+        return f"""
+        Based on this summary of a mock interview, provide comprehensive feedback:
         
         Job Title: {interview_data.get('job_title', 'Unknown')}
-        Questions and Responses: {interview_data.get('responses', [])}
+        {format_summary(interview_data["summary"])}
         
         Please provide:
         1. Overall score (1-10)
@@ -213,36 +573,257 @@ class AIService:
         3. Key strengths
         4. Areas for improvement
         5. Recommendations for future interviews
+        
+        Format your response as JSON with keys: overall_score, summary, strengths, improvements, recommendations
         """
+    
+    @staticmethod
+    def _normalize_feedback(parsed: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "overall_score": float(parsed["overall_score"]),
+            "summary": str(parsed.get("summary", "")),
+            "strengths": list(parsed.get("strengths", [])),
+            "improvements": list(parsed.get("improvements", [])),
+            "recommendations": list(parsed.get("recommendations", []))
+        }
+    
+    @staticmethod
+    def _placeholder_feedback() -> Dict[str, Any]:
+        return {
+            "overall_score": 7.0,
+            "summary": "Good performance with room for improvement in technical areas.",
+            "strengths": ["Clear communication", "Good behavioral examples"],
+            "improvements": ["More technical depth", "Better STAR method usage"],
+            "recommendations": ["Practice technical questions", "Prepare more examples"]
+        }
+    
+    @staticmethod
+    def _fallback_feedback() -> Dict[str, Any]:
+        return {
+            "overall_score": 5.0,
+            "summary": "Unable to generate feedback at this time.",
+            "strengths": [],
+            "improvements": [],
+            "recommendations": []
+        }
+    
+    def is_fallback_feedback(self, feedback: Dict[str, Any]) -> bool:
+        """Whether feedback is the generic answer returned when generation failed"""
+        return feedback == self._fallback_feedback()
+    
+    async def generate_interview_feedback(self, interview_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate overall interview feedback"""
+        
+        prompt = self._feedback_prompt(interview_data)
         
         try:
-            '''enable this when you want to use the openai api'''
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert career coach providing interview feedback."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.5,
-                max_tokens=800
-            )
-            # content = response.choices[0].message.content
-            '''enable this when you want to use the openai api'''
+            if settings.openai_enabled:
+                content = await self._chat_completion(
+                    "You are an expert career coach providing interview feedback.",
+                    prompt,
+                    temperature=0.5,
+                    max_tokens=800,
+                    priority=Priority.BULK,
+                    operation="generate_interview_feedback"
+                )
+                return self._normalize_feedback(self._parse_json(content))
             
-            return {
-                "overall_score": 7.0,
-                "summary": "Good performance with room for improvement in technical areas.",
-                "strengths": ["Clear communication", "Good behavioral examples"],
-                "improvements": ["More technical depth", "Better STAR method usage"],
-                "recommendations": ["Practice technical questions", "Prepare more examples"]
-            }
+            # Placeholder feedback while the OpenAI API is disabled
+            return self._placeholder_feedback()
             
         except Exception as e:
             print(f"Error generating feedback: {e}")
-            return {
-                "overall_score": 5.0,
-                "summary": "Unable to generate feedback at this time.",
-                "strengths": [],
-                "improvements": [],
-                "recommendations": []
-            } 
\ No newline at end of file
+            return self._fallback_feedback()
+    
+    async def stream_interview_feedback(self, interview_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Generate overall interview feedback, yielding tokens and partial fields as they arrive
+        
+        Yields events of the form {"event": ..., "data": ...}: "token" for each text delta,
+        "field" whenever a partially parsed summary/strengths/improvements/recommendations value
+        grows, and a final "result" with the fully parsed feedback.
+        """
+        
+        prompt = self._feedback_prompt(interview_data)
+        
+        if settings.openai_enabled:
+            deltas = self._chat_completion_stream(
+                "You are an expert career coach providing interview feedback.",
+                prompt,
+                temperature=0.5,
+                max_tokens=800,
+                priority=Priority.BULK,
+                operation="stream_interview_feedback"
+            )
+        else:
+            # Placeholder feedback while the OpenAI API is disabled, streamed in small chunks
+            deltas = _chunked(json.dumps(self._placeholder_feedback()), 16)
+        
+        content = ""
+        fields: Dict[str, Any] = {}
+        try:
+            async for delta in deltas:
+                content += delta
+                yield {"event": "token", "data": {"text": delta}}
+                
+                partial = parse_partial_json(content)
+                if not isinstance(partial, dict):
+                    continue
+                for name in STREAMED_FEEDBACK_FIELDS:
+                    if name in partial and partial[name] != fields.get(name):
+                        fields[name] = partial[name]
+                        yield {"event": "field", "data": {"name": name, "value": partial[name]}}
+            
+            result = self._normalize_feedback(self._parse_json(content))
+        except Exception as e:
+            print(f"Error streaming feedback: {e}")
+            result = self._fallback_feedback()
+        
+        yield {"event": "result", "data": result}
+
+
+def _retry_after(error: "openai.RateLimitError") -> Optional[float]:
+    """Seconds the API asked us to wait, if it said"""
+    try:
+        return float(error.response.headers["retry-after"])
+    except (KeyError, ValueError, AttributeError):
+        return None
+
+
+async def _chunked(text: str, size: int) -> AsyncIterator[str]:
+    for i in range(0, len(text), size):
+        yield text[i:i + size]
+
+
+def parse_partial_json(text: str) -> Any:
+    """Best-effort parse of a JSON document that may be cut off mid-stream
+    
+    Closes any open string, array and object so the prefix can be decoded.
+    Returns None when the prefix ends somewhere that cannot be completed yet,
+    such as inside a key or a number.
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
+    text = text[start:]
+    
+    closers = []
+    in_string = False
+    escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            closers.append("}")
+        elif char == "[":
+            closers.append("]")
+        elif char in "}]" and closers:
+            closers.pop()
+    
+    if closers and not in_string and text[-1].isdigit():
+        # More digits may follow: 1 could still become 10
+        return None
+    if escaped:
+        text = text[:-1]
+    if in_string:
+        text += '"'
+    text = text.rstrip().rstrip(",")
+    try:
+        return json.loads(text + "".join(reversed(closers)))
+    except json.JSONDecodeError:
+        return None
+
+
+class JSONArrayStream:
+    """Incremental parser for a JSON array arriving in chunks
+    
+    feed() returns each element of the first array of objects in the text as
+    soon as its closing bracket arrives. Text around the array, such as
+    markdown fences, a wrapping object or an array of something else, is
+    skipped.
+    """
+    
+    def __init__(self):
+        self._depth = 0
+        self._array_depth: Optional[int] = None  # depth inside the array; elements sit below it
+        self._candidate_depth: Optional[int] = None  # an array whose first element is not known yet
+        self._in_string = False
+        self._escaped = False
+        self._element: List[str] = []
+        self._done = False
+    
+    def feed(self, chunk: str) -> List[Any]:
+        items = []
+        for char in chunk:
+            if self._done:
+                break
+            if self._candidate_depth is not None and not char.isspace():
+                # Only an array that opens with an object is the one we are after
+                if char == "{":
+                    self._array_depth = self._candidate_depth
+                self._candidate_depth = None
+            in_element = self._array_depth is not None and self._depth > self._array_depth
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "[{":
+                self._depth += 1
+                if self._array_depth is None:
+                    if char == "[":
+                        self._candidate_depth = self._depth
+                    continue
+                in_element = self._depth > self._array_depth
+            elif char in "]}":
+                if self._array_depth is not None and self._depth == self._array_depth:
+                    self._done = True  # the array itself closed
+                    continue
+                self._depth -= 1
+                if in_element:
+                    self._element.append(char)
+                    if self._depth == self._array_depth:
+                        items.extend(self._decode_element())
+                continue
+            if in_element:
+                self._element.append(char)
+        return items
+    
+    def _decode_element(self) -> List[Any]:
+        text = "".join(self._element)
+        self._element = []
+        try:
+            return [json.loads(text)]
+        except json.JSONDecodeError:
+            print(f"Skipping malformed array element: {text[:80]}")
+            return []
+
+
+# Shared service instance so every caller reuses the same connection pool
+_ai_service: Optional[AIService] = None
+
+
+def get_ai_service() -> AIService:
+    """Return the shared AIService, creating it on first use"""
+    global _ai_service
+    if _ai_service is None:
+        _ai_service = AIService()
+    return _ai_service
+
+
+async def close_ai_service():
+    """Close the shared AIService if it was created"""
+    global _ai_service
+    if _ai_service is not None:
+        await _ai_service.aclose()
+        _ai_service = None
\ No newline at end of file
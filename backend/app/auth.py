@@ -0,0 +1,28 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from .config import settings
+
+
+def create_session_token(user_id: int, interview_id: int) -> str:
+    """Sign a token that lets its holder open the session channel of one interview"""
+    from jose import jwt  # deferred: only needed once an interview starts
+
+    expires = datetime.now(timezone.utc) + timedelta(minutes=settings.session_token_expire_minutes)
+    claims = {"sub": str(user_id), "interview_id": interview_id, "exp": expires}
+    return jwt.encode(claims, settings.jwt_secret, algorithm=settings.jwt_algorithm)
+
+
+def verify_session_token(token: str, interview_id: int) -> Optional[int]:
+    """The user id in a valid, unexpired token for this interview, else None"""
+    from jose import JWTError, jwt
+
+    try:
+        claims = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
+    except JWTError:
+        return None
+    if claims.get("interview_id") != interview_id:
+        return None
+    try:
+        return int(claims["sub"])
+    except (KeyError, TypeError, ValueError):
+        return None
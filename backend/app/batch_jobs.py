@@ -0,0 +1,201 @@
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Set, Tuple
+import redis.asyncio as redis
+from .ai_service import get_ai_service
+from .cache import content_key
+from .config import settings
+from .crud import create_interviews_with_questions
+from .database import open_session
+from .redis_client import get_redis
+from .tts_service import tts_service
+
+
+class BatchJobStore:
+    """Batch job progress with TTL, kept in Redis when configured and in-process otherwise"""
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._local: Dict[str, tuple] = {}
+
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return f"batch:{job_id}"
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        client = get_redis()
+        if client is not None:
+            try:
+                raw = await client.get(self._key(job_id))
+                return json.loads(raw) if raw is not None else None
+            except (redis.RedisError, OSError) as e:
+                print(f"Redis batch job read failed: {e}")
+                return None
+
+        entry = self._local.get(job_id)
+        if entry is None:
+            return None
+        expires_at, job = entry
+        if expires_at < time.monotonic():
+            del self._local[job_id]
+            return None
+        return job
+
+    async def put(self, job: Dict[str, Any]):
+        client = get_redis()
+        if client is not None:
+            try:
+                await client.set(self._key(job["job_id"]), json.dumps(job), ex=self.ttl_seconds)
+            except (redis.RedisError, OSError) as e:
+                print(f"Redis batch job write failed: {e}")
+            return
+
+        now = time.monotonic()
+        for job_id in [k for k, (expires_at, _) in self._local.items() if expires_at < now]:
+            del self._local[job_id]
+        self._local[job["job_id"]] = (now + self.ttl_seconds, job)
+
+
+class BatchJobs:
+    """Batch interview creation jobs run by this process
+
+    Items with the same job title and description share one question
+    generation; distinct postings are generated concurrently, at most
+    `concurrency` at a time. Interviews are written in bulk as their questions
+    arrive, and each item succeeds or fails on its own.
+    """
+
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        self._tasks: Set[asyncio.Task] = set()
+        self._running: Set[str] = set()
+
+    async def submit(self, user_id: int, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Record a job for the items and start it in the background; returns the job"""
+        groups: Dict[str, List[int]] = {}
+        for index, item in enumerate(items):
+            groups.setdefault(content_key(item["job_title"], item["job_description"]), []).append(index)
+
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "user_id": user_id,
+            "status": "running",
+            "total": len(items),
+            "completed": 0,
+            "failed": 0,
+            "postings": len(groups),
+            "items": [
+                {"index": index, "status": "pending", "interview_id": None, "error": None}
+                for index in range(len(items))
+            ]
+        }
+        await batch_job_store.put(job)
+
+        self._running.add(job["job_id"])
+        task = asyncio.create_task(self._run(job, items, list(groups.values())))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def _run(self, job: Dict[str, Any], items: List[Dict[str, Any]], groups: List[List[int]]):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        pending: List[Tuple[List[int], List[Dict[str, Any]]]] = []
+        writer: Optional[asyncio.Task] = None
+
+        async def generate(indexes: List[int]):
+            nonlocal writer
+            posting = items[indexes[0]]
+            error = "No questions were generated"
+            async with semaphore:
+                try:
+                    questions = await get_ai_service().generate_interview_questions(
+                        posting["job_description"],
+                        posting["job_title"]
+                    )
+                except Exception as e:
+                    questions, error = [], str(e)
+
+            if not questions:
+                self._finish_items(job, indexes, error=error)
+                await batch_job_store.put(job)
+                return
+            pending.append((indexes, questions))
+            if writer is None or writer.done():
+                writer = asyncio.create_task(self._write(job, items, pending))
+
+        try:
+            await asyncio.gather(*(generate(indexes) for indexes in groups))
+            if writer is not None:
+                await writer
+        finally:
+            job["status"] = "completed"
+            await batch_job_store.put(job)
+            self._running.discard(job["job_id"])
+
+    async def _write(
+        self,
+        job: Dict[str, Any],
+        items: List[Dict[str, Any]],
+        pending: List[Tuple[List[int], List[Dict[str, Any]]]]
+    ):
+        # Postings generated while a batch is being written go out together in the next one
+        while pending:
+            batch = list(pending)
+            pending.clear()
+            try:
+                await self._insert(job, items, batch)
+            except Exception as e:
+                # Write each posting on its own, so one bad item doesn't fail the others
+                print(f"Error saving batch {job['job_id']}, retrying per posting: {e}")
+                for indexes, questions in batch:
+                    try:
+                        await self._insert(job, items, [(indexes, questions)])
+                    except Exception as e:
+                        self._finish_items(job, indexes, error=f"Error saving interview: {e}")
+            await batch_job_store.put(job)
+
+            if settings.tts_enabled:
+                for _, questions in batch:
+                    task = asyncio.create_task(tts_service.synthesize_questions([q["question_text"] for q in questions]))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+
+    async def _insert(
+        self,
+        job: Dict[str, Any],
+        items: List[Dict[str, Any]],
+        batch: List[Tuple[List[int], List[Dict[str, Any]]]]
+    ):
+        indexes = [index for group, _ in batch for index in group]
+        entries = [(items[index], questions) for group, questions in batch for index in group]
+        async with open_session() as db:
+            interview_ids = await db.run(create_interviews_with_questions, job["user_id"], entries)
+            await db.commit()
+        for index, interview_id in zip(indexes, interview_ids):
+            self._finish_items(job, [index], interview_id=interview_id)
+
+    @staticmethod
+    def _finish_items(job: Dict[str, Any], indexes: List[int], interview_id: Optional[int] = None, error: Optional[str] = None):
+        for index in indexes:
+            item = job["items"][index]
+            if interview_id is not None:
+                item.update(status="completed", interview_id=interview_id)
+                job["completed"] += 1
+            else:
+                item.update(status="failed", error=error)
+                job["failed"] += 1
+
+    async def drain(self, timeout: float):
+        """Give running jobs up to `timeout` seconds to finish, e.g. at shutdown"""
+        if self._tasks:
+            await asyncio.wait(set(self._tasks), timeout=timeout)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {"running": len(self._running)}
+
+
+batch_job_store = BatchJobStore(ttl_seconds=settings.batch_job_ttl)
+batch_jobs = BatchJobs(concurrency=settings.batch_concurrency)
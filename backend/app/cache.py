@@ -0,0 +1,99 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+import redis.asyncio as redis
+from .config import settings
+from .redis_client import get_redis
+
+
+def content_key(*parts: str) -> str:
+    """Hash normalized text parts into a stable cache key"""
+    normalized = [" ".join(part.lower().split()) for part in parts]
+    return hashlib.sha256("\x1f".join(normalized).encode("utf-8")).hexdigest()
+
+
+class TwoTierCache:
+    """In-process LRU cache in front of a shared Redis tier, both with TTL"""
+    
+    def __init__(self, namespace: str, max_entries: int, ttl_seconds: int):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.stats: Dict[str, int] = {
+            "local_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "redis_errors": 0
+        }
+    
+    def _redis_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+    
+    def _get_local(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+    
+    def _set_local(self, key: str, value: Any):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+    
+    async def get(self, key: str) -> Optional[Any]:
+        """Look up a key in the local tier, then in Redis"""
+        value = self._get_local(key)
+        if value is not None:
+            self.stats["local_hits"] += 1
+            return value
+        
+        client = get_redis()
+        if client is not None:
+            try:
+                raw = await client.get(self._redis_key(key))
+            except (redis.RedisError, OSError) as e:
+                print(f"Redis cache read failed: {e}")
+                self.stats["redis_errors"] += 1
+                raw = None
+            if raw is not None:
+                value = json.loads(raw)
+                self._set_local(key, value)
+                self.stats["redis_hits"] += 1
+                return value
+        
+        self.stats["misses"] += 1
+        return None
+    
+    async def set(self, key: str, value: Any):
+        """Store a JSON-serializable value in both tiers"""
+        self._set_local(key, value)
+        
+        client = get_redis()
+        if client is not None:
+            try:
+                await client.set(self._redis_key(key), json.dumps(value), ex=self.ttl_seconds)
+            except (redis.RedisError, OSError) as e:
+                print(f"Redis cache write failed: {e}")
+                self.stats["redis_errors"] += 1
+    
+    def clear(self):
+        """Drop every entry from the local tier"""
+        self._entries.clear()
+
+
+question_cache = TwoTierCache(
+    "questions",
+    max_entries=settings.question_cache_max_entries,
+    ttl_seconds=settings.question_cache_ttl
+)
@@ -0,0 +1,282 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import func, insert, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, contains_eager, selectinload
+from .interview_summary import update_running_summary
+from .models import Interview, Question, Response
+
+
+def get_interview(db: Session, interview_id: int, with_details: bool = False) -> Optional[Interview]:
+    """Load an interview, optionally with its questions and responses eagerly loaded"""
+    query = db.query(Interview).filter(Interview.id == interview_id)
+    if with_details:
+        query = query.options(
+            selectinload(Interview.questions),
+            selectinload(Interview.responses)
+        )
+    return query.first()
+
+
+def create_interview_with_questions(
+    db: Session,
+    user_id: int,
+    interview_data: Dict[str, Any],
+    questions_data: List[Dict[str, Any]],
+    question_status: str = "ready"
+) -> Dict[str, Any]:
+    """Insert an interview and all of its questions in one transaction
+    
+    Questions are written with a single bulk INSERT ... RETURNING (batched by
+    insertmanyvalues), and the returned columns are used to build the result
+    without reading rows back. The caller commits.
+    """
+    interview_row = db.execute(
+        insert(Interview).returning(Interview.id, Interview.status, Interview.created_at),
+        [{
+            "user_id": user_id,
+            "job_title": interview_data["job_title"],
+            "job_description": interview_data["job_description"],
+            "company": interview_data.get("company"),
+            "question_status": question_status
+        }]
+    ).one()
+    
+    question_rows = add_questions(db, interview_row.id, questions_data)
+    
+    return {
+        "id": interview_row.id,
+        "user_id": user_id,
+        "job_title": interview_data["job_title"],
+        "job_description": interview_data["job_description"],
+        "company": interview_data.get("company"),
+        "status": interview_row.status,
+        "question_status": question_status,
+        "created_at": interview_row.created_at,
+        "completed_at": None,
+        "questions": sorted(question_rows, key=lambda q: q["order_index"]),
+        "responses": []
+    }
+
+
+def create_interviews_with_questions(
+    db: Session,
+    user_id: int,
+    entries: List[Tuple[Dict[str, Any], List[Dict[str, Any]]]]
+) -> List[int]:
+    """Insert many (interview_data, questions_data) pairs with one INSERT per table
+    
+    Returns the new interview ids in the order of entries. The caller commits.
+    """
+    if not entries:
+        return []
+    interview_rows = db.execute(
+        insert(Interview).returning(Interview.id, sort_by_parameter_order=True),
+        [
+            {
+                "user_id": user_id,
+                "job_title": interview_data["job_title"],
+                "job_description": interview_data["job_description"],
+                "company": interview_data.get("company")
+            }
+            for interview_data, _ in entries
+        ]
+    ).all()
+    interview_ids = [row.id for row in interview_rows]
+    
+    question_values = [
+        {
+            "interview_id": interview_id,
+            "question_text": q_data["question_text"],
+            "question_type": q_data["question_type"],
+            "order_index": q_data["order_index"]
+        }
+        for interview_id, (_, questions_data) in zip(interview_ids, entries)
+        for q_data in questions_data
+    ]
+    if question_values:
+        db.execute(insert(Question), question_values)
+    return interview_ids
+
+
+def add_questions(db: Session, interview_id: int, questions_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Bulk insert questions of an interview and return them as dicts; the caller commits"""
+    if not questions_data:
+        return []
+    rows = db.execute(
+        insert(Question).returning(
+            Question.id,
+            Question.interview_id,
+            Question.question_text,
+            Question.question_type,
+            Question.order_index,
+            Question.created_at
+        ),
+        [
+            {
+                "interview_id": interview_id,
+                "question_text": q_data["question_text"],
+                "question_type": q_data["question_type"],
+                "order_index": q_data["order_index"]
+            }
+            for q_data in questions_data
+        ]
+    ).all()
+    return [row._asdict() for row in rows]
+
+
+def set_question_status(db: Session, interview_id: int, question_status: str):
+    """Record how an interview's question generation ended; the caller commits"""
+    db.query(Interview).filter(Interview.id == interview_id).update(
+        {"question_status": question_status}, synchronize_session=False
+    )
+
+
+def get_responses_with_questions(db: Session, interview_id: int) -> List[Tuple[Response, Question]]:
+    """Load an interview's responses joined to their questions, in question order"""
+    return (
+        db.query(Response, Question)
+        .join(Question, Response.question_id == Question.id)
+        .filter(Response.interview_id == interview_id)
+        .order_by(Question.order_index, Response.id)
+        .all()
+    )
+
+
+def get_question(db: Session, interview_id: int, question_id: int) -> Optional[Question]:
+    """Load one question of an interview"""
+    return db.query(Question).filter(
+        Question.id == question_id,
+        Question.interview_id == interview_id
+    ).first()
+
+
+def get_responses(db: Session, interview_id: int) -> List[Response]:
+    """Load an interview's responses in submission order"""
+    return db.query(Response).filter(Response.interview_id == interview_id).order_by(Response.id).all()
+
+
+def get_response_evaluations(db: Session, interview_id: int) -> List[Dict[str, Any]]:
+    """An interview's responses as plain dicts of their evaluation fields, in submission order"""
+    rows = (
+        db.query(
+            Response.id,
+            Response.question_id,
+            Response.evaluation_status,
+            Response.score,
+            Response.ai_feedback.label("feedback"),
+            Response.suggestions
+        )
+        .filter(Response.interview_id == interview_id)
+        .order_by(Response.id)
+        .all()
+    )
+    return [row._asdict() for row in rows]
+
+
+def save_response(
+    db: Session,
+    interview_id: int,
+    question: Dict[str, Any],
+    response_text: str,
+    evaluation: Dict[str, Any],
+    evaluation_status: str,
+    complete_interview: bool
+) -> Optional[int]:
+    """Insert a response and, for the last answer, mark the interview completed in the same commit
+    
+    A completed evaluation is folded into the interview's running summary in that commit too.
+    Returns None, saving nothing, if the question already has a response.
+    """
+    response = Response(
+        interview_id=interview_id,
+        question_id=question["id"],
+        response_text=response_text,
+        ai_feedback=evaluation["feedback"],
+        suggestions=evaluation["suggestions"],
+        score=evaluation["score"],
+        evaluation_status=evaluation_status
+    )
+    db.add(response)
+    try:
+        db.flush()
+    except IntegrityError:
+        # Answered already, e.g. by a concurrent duplicate submission
+        db.rollback()
+        return None
+    response_id = response.id
+    
+    if evaluation_status == "completed":
+        update_running_summary(db, interview_id, question["question_type"], question["order_index"], evaluation)
+    
+    if complete_interview:
+        db.query(Interview).filter(Interview.id == interview_id).update(
+            {"status": "completed", "completed_at": func.now()},
+            synchronize_session=False
+        )
+    db.commit()
+    return response_id
+
+
+def get_response_with_question(db: Session, response_id: int) -> Optional[Response]:
+    """Load a response with its question populated by the same query"""
+    return (
+        db.query(Response)
+        .join(Response.question)
+        .options(contains_eager(Response.question))
+        .filter(Response.id == response_id)
+        .first()
+    )
+
+
+def encode_history_cursor(created_at: datetime, interview_id: int) -> str:
+    """Encode the (created_at, id) position of the last row on a history page"""
+    payload = json.dumps([created_at.isoformat(), interview_id])
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_history_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a history cursor, raising ValueError if it is malformed"""
+    try:
+        created_at, interview_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(interview_id)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def get_interview_history_page(
+    db: Session,
+    user_id: int,
+    limit: int,
+    after: Optional[Tuple[datetime, int]] = None
+) -> Tuple[list, Optional[str]]:
+    """Load one page of a user's interviews, newest first, without job descriptions
+    
+    Uses keyset pagination on (created_at, id) so every page is an index range scan
+    on ix_interviews_user_id_created_at. Returns the rows and the next page's cursor.
+    """
+    query = db.query(
+        Interview.id,
+        Interview.job_title,
+        Interview.company,
+        Interview.status,
+        Interview.created_at,
+        Interview.completed_at
+    ).filter(Interview.user_id == user_id)
+    if after is not None:
+        created_at, interview_id = after
+        column, value = Interview.created_at, created_at
+        if db.get_bind().dialect.name == "sqlite":
+            # SQLite keeps timestamps as text in varying formats; compare them normalized
+            column, value = func.datetime(column), func.datetime(value)
+        query = query.filter(tuple_(column, Interview.id) < tuple_(value, interview_id))
+    
+    rows = query.order_by(Interview.created_at.desc(), Interview.id.desc()).limit(limit + 1).all()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_history_cursor(rows[-1].created_at, rows[-1].id)
+    return rows, next_cursor
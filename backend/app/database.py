@@ -1,11 +1,54 @@
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Optional, Union
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from .config import settings
+from .metrics import TimedAsyncAdaptedQueuePool, TimedQueuePool, instrument_engine
 
-engine = create_engine(settings.database_url)
+# Async drivers used when DB_ASYNC is enabled and no ASYNC_DATABASE_URL is given
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def _pool_options(url: str, poolclass) -> Dict[str, Any]:
+    # SQLite uses its own single-connection pools that take no sizing options
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def _async_database_url() -> str:
+    if settings.async_database_url:
+        return settings.async_database_url
+    url = make_url(settings.database_url)
+    return str(url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)))
+
+
+engine = create_engine(settings.database_url, **_pool_options(settings.database_url, TimedQueuePool))
+instrument_engine(engine, "sync")
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = None
+AsyncSessionLocal: Optional[async_sessionmaker] = None
+if settings.db_async:
+    async_url = _async_database_url()
+    async_engine = create_async_engine(async_url, **_pool_options(async_url, TimedAsyncAdaptedQueuePool))
+    instrument_engine(async_engine.sync_engine, "async")
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
@@ -14,4 +57,47 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+
+class SessionRunner:
+    """Runs sync-style database work without blocking the event loop
+    
+    On the async engine the work runs through AsyncSession.run_sync, so the
+    same query code talks to asyncpg without a thread. With the sync
+    fallback it runs on a regular Session in the threadpool.
+    """
+    
+    def __init__(self, session: Union[AsyncSession, Session]):
+        self.session = session
+    
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Call fn(session, *args, **kwargs) with a sync Session"""
+        if isinstance(self.session, AsyncSession):
+            return await self.session.run_sync(fn, *args, **kwargs)
+        return await run_in_threadpool(fn, self.session, *args, **kwargs)
+    
+    async def commit(self):
+        await self.run(lambda session: session.commit())
+    
+    async def rollback(self):
+        await self.run(lambda session: session.rollback())
+
+
+@asynccontextmanager
+async def open_session():
+    """Open a SessionRunner on the async engine when enabled, the sync one otherwise"""
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as session:
+            yield SessionRunner(session)
+    else:
+        session = SessionLocal()
+        try:
+            yield SessionRunner(session)
+        finally:
+            session.close()
+
+
+async def get_session_runner():
+    async with open_session() as db:
+        yield db
@@ -0,0 +1,32 @@
+from typing import Optional
+from fastapi import Depends
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from .database import SessionRunner, get_session_runner
+from .models import User
+
+# The mock user is resolved once per process instead of on every request
+_current_user_id: Optional[int] = None
+
+
+def _resolve_mock_user_id(db: Session) -> int:
+    # For now, use a mock user (in production, you'd get this from auth)
+    user = db.query(User).first()
+    if not user:
+        user = User(email="test@example.com", name="Test User")
+        db.add(user)
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent first request created it
+            db.rollback()
+            user = db.query(User).filter(User.email == "test@example.com").one()
+    return user.id
+
+
+async def get_current_user_id(db: SessionRunner = Depends(get_session_runner)) -> int:
+    """Resolve the id of the requesting user"""
+    global _current_user_id
+    if _current_user_id is None:
+        _current_user_id = await db.run(_resolve_mock_user_id)
+    return _current_user_id
@@ -0,0 +1,154 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+from fastapi import BackgroundTasks
+from sqlalchemy.orm import Session
+from .ai_service import AIService, get_ai_service
+from .config import settings
+from .crud import get_response_with_question
+from .database import open_session
+from .interview_summary import update_running_summary
+from .models import Interview, Response
+from .prescorer import insufficient_evaluation, prescorer
+
+
+# Evaluations re-queued by this process, by response id, and when
+_requeued: Dict[int, float] = {}
+_background: Set[asyncio.Task] = set()
+
+
+class EvaluationsPending(Exception):
+    """An interview still has unscored answers; stale_ids are those pending for longer than expected"""
+    
+    def __init__(self, stale_ids: List[int]):
+        super().__init__(f"{len(stale_ids)} stale pending evaluations")
+        self.stale_ids = stale_ids
+
+
+def _load_pending_evaluation(db: Session, response_id: int) -> Optional[Dict[str, Any]]:
+    response = get_response_with_question(db, response_id)
+    if not response or response.evaluation_status == "completed":
+        return None
+    return {
+        "interview_id": response.interview_id,
+        "question": response.question.question_text,
+        "response": response.response_text,
+        "question_type": response.question.question_type,
+        "order_index": response.question.order_index,
+        "job_description": db.query(Interview.job_description).filter(Interview.id == response.interview_id).scalar()
+    }
+
+
+def _store_evaluation(db: Session, response_id: int, values: Dict[str, Any]):
+    db.query(Response).filter(Response.id == response_id).update(values, synchronize_session=False)
+    db.commit()
+
+
+def _store_completed_evaluation(db: Session, response_id: int, pending: Dict[str, Any], evaluation: Dict[str, Any]):
+    # The running summary is updated in the same commit as the response
+    db.query(Response).filter(Response.id == response_id).update({
+        "ai_feedback": evaluation["feedback"],
+        "score": evaluation["score"],
+        "suggestions": evaluation["suggestions"],
+        "evaluation_status": "completed"
+    }, synchronize_session=False)
+    update_running_summary(db, pending["interview_id"], pending["question_type"], pending["order_index"], evaluation)
+    db.commit()
+
+
+async def screen_response(
+    question: Dict[str, Any],
+    response_text: str,
+    job_description: str,
+    ai_service: Optional[AIService] = None
+) -> Tuple[Dict[str, Any], str, Optional[float]]:
+    """Initial (evaluation, evaluation_status, provisional_score) for an answer that is scored after it is saved
+    
+    Answers the pre-scorer rejects are settled on the spot; the rest are pending.
+    """
+    ai_service = ai_service or get_ai_service()
+    prescore = await ai_service.prescore_response(question["question_text"], response_text, job_description)
+    if prescore and prescore["insufficient"]:
+        # Clearly insufficient: score it now instead of queueing an LLM call
+        prescorer.record_llm_avoided()
+        return insufficient_evaluation(prescore), "completed", None
+    # Save now and score later so the next question isn't blocked on the LLM
+    evaluation = {"score": None, "feedback": None, "suggestions": []}
+    return evaluation, "pending", prescore["score"] if prescore else None
+
+
+async def evaluate_stored_response(response_id: int, ai_service: Optional[AIService] = None) -> Optional[Dict[str, Any]]:
+    """Score a saved response and write the evaluation back to the database
+    
+    Returns the evaluation, or None if the response was already scored.
+    """
+    ai_service = ai_service or get_ai_service()
+    async with open_session() as db:
+        pending = await db.run(_load_pending_evaluation, response_id)
+        if pending is None:
+            return
+        
+        try:
+            evaluation = await ai_service.evaluate_response(
+                pending["question"],
+                pending["response"],
+                pending["question_type"],
+                job_description=pending["job_description"],
+                prescore=False,
+                raise_errors=True
+            )
+        except Exception as e:
+            print(f"Error evaluating response {response_id}: {e}")
+            await db.run(_store_evaluation, response_id, {"evaluation_status": "failed"})
+            raise
+        
+        await db.run(_store_completed_evaluation, response_id, pending, evaluation)
+        return evaluation
+
+
+async def evaluate_in_background(response_id: int):
+    """evaluate_stored_response for fire-and-forget callers; a failure is already stored on the response"""
+    try:
+        await evaluate_stored_response(response_id)
+    except Exception:
+        pass
+
+
+def queue_evaluation(response_id: int, background_tasks: Optional[BackgroundTasks] = None) -> Optional[asyncio.Task]:
+    """Score a pending response on the Celery workers, or in this process without them
+    
+    In process, the scoring runs after the response when background_tasks is
+    given, and otherwise as a task that is returned so the caller can await
+    the evaluation. Returns None when the scoring happens elsewhere or later.
+    """
+    if settings.evaluation_mode == "celery":
+        from .worker import evaluate_response_task
+        try:
+            evaluate_response_task.delay(response_id)
+            return None
+        except Exception as e:
+            # Broker unavailable: score in-process rather than leave it pending
+            print(f"Error queueing evaluation: {e}")
+    if background_tasks is not None:
+        background_tasks.add_task(evaluate_in_background, response_id)
+        return None
+    task = asyncio.ensure_future(evaluate_stored_response(response_id))
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+    # A failure is already stored on the response; mark it retrieved when nobody awaits the task
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    return task
+
+
+def requeue_evaluations(response_ids: List[int]):
+    """Queue evaluations again whose first attempt was lost, e.g. to a restart
+    
+    Each response is re-queued at most once per evaluation_stale_after by this process.
+    """
+    now = time.monotonic()
+    for response_id in [k for k, queued_at in _requeued.items() if now - queued_at >= settings.evaluation_stale_after]:
+        del _requeued[response_id]
+    for response_id in response_ids:
+        if response_id not in _requeued:
+            _requeued[response_id] = now
+            queue_evaluation(response_id)
@@ -0,0 +1,232 @@
+import argparse
+import json
+import sys
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+from .config import settings
+from .database import SessionLocal
+from .models import Interview, Question, Response
+
+COMPRESSIONS = ("none", "gzip", "zstd")
+
+INTERVIEW_COLUMNS = (
+    Interview.id,
+    Interview.user_id,
+    Interview.job_title,
+    Interview.job_description,
+    Interview.company,
+    Interview.status,
+    Interview.question_status,
+    Interview.created_at,
+    Interview.completed_at,
+    Interview.updated_at
+)
+QUESTION_COLUMNS = (
+    Question.interview_id,
+    Question.id,
+    Question.question_text,
+    Question.question_type,
+    Question.order_index,
+    Question.created_at
+)
+RESPONSE_COLUMNS = (
+    Response.interview_id,
+    Response.id,
+    Response.question_id,
+    Response.response_text,
+    Response.ai_feedback,
+    Response.suggestions,
+    Response.score,
+    Response.evaluation_status,
+    Response.created_at,
+    Response.updated_at
+)
+
+
+def export_cutoff() -> datetime:
+    """Upper bound of an export's changes, and the watermark the next incremental export starts from
+
+    Lagging behind now by EXPORT_SAFETY_LAG leaves time for transactions
+    whose timestamps are already past the cutoff to commit.
+    """
+    return datetime.now(timezone.utc) - timedelta(seconds=settings.export_safety_lag)
+
+
+def iter_interview_batches(
+    db: Session,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    after: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    batch_size: int = 500
+) -> Iterator[List[Dict[str, Any]]]:
+    """Yield interviews with their questions and responses nested, batch_size at a time, oldest first
+
+    after selects interviews that changed since a watermark, themselves or
+    through a response or its evaluation; until closes that window. Interviews
+    are read through a server-side cursor, and each batch's questions and
+    responses with one query apiece, so memory depends on batch_size rather
+    than on the size of the tables. Rows are read as plain tuples, never as
+    ORM objects held by the session.
+    """
+    query = select(*INTERVIEW_COLUMNS).order_by(Interview.created_at, Interview.id)
+    if created_from is not None:
+        query = query.where(Interview.created_at >= created_from)
+    if created_to is not None:
+        query = query.where(Interview.created_at < created_to)
+    if after is not None:
+        interview_changed = Interview.updated_at > after
+        response_changed = Response.updated_at > after
+        if until is not None:
+            interview_changed = and_(interview_changed, Interview.updated_at <= until)
+            response_changed = and_(response_changed, Response.updated_at <= until)
+        query = query.where(or_(
+            interview_changed,
+            Interview.id.in_(select(Response.interview_id).where(response_changed))
+        ))
+
+    result = db.execute(query.execution_options(stream_results=True, yield_per=batch_size))
+    for rows in result.partitions():
+        interviews = {row.id: {**row._asdict(), "questions": [], "responses": []} for row in rows}
+        ids = list(interviews)
+
+        for row in db.execute(
+            select(*QUESTION_COLUMNS).where(Question.interview_id.in_(ids)).order_by(Question.interview_id, Question.order_index)
+        ):
+            question = row._asdict()
+            interviews[question.pop("interview_id")]["questions"].append(question)
+        for row in db.execute(
+            select(*RESPONSE_COLUMNS).where(Response.interview_id.in_(ids)).order_by(Response.interview_id, Response.id)
+        ):
+            response = row._asdict()
+            interviews[response.pop("interview_id")]["responses"].append(response)
+
+        yield list(interviews.values())
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_ndjson(batches: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    """One JSON object per line, one chunk per batch"""
+    for batch in batches:
+        yield "".join(json.dumps(record, default=_json_default, separators=(",", ":")) + "\n" for record in batch).encode("utf-8")
+
+
+def check_compression(compression: str):
+    """Raise ValueError if the compression is unknown or its package is missing"""
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression: {compression}")
+    if compression == "zstd":
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            raise ValueError("zstd compression needs the zstandard package")
+
+
+def compress(chunks: Iterable[bytes], compression: str) -> Iterator[bytes]:
+    """Compress a byte stream on the fly with gzip or zstd, or pass it through"""
+    if compression == "none":
+        yield from chunks
+        return
+
+    if compression == "gzip":
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip container
+    else:
+        # Deferred: only needed when zstd is asked for
+        import zstandard
+        compressor = zstandard.ZstdCompressor().compressobj()
+
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def export_interviews(
+    compression: str = "none",
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    after: Optional[datetime] = None,
+    until: Optional[datetime] = None
+) -> Iterator[bytes]:
+    """Stream the NDJSON export, compressed, from a sync session of its own"""
+    db = SessionLocal()
+    try:
+        batches = iter_interview_batches(db, created_from, created_to, after, until, settings.export_batch_size)
+        yield from compress(encode_ndjson(batches), compression)
+    finally:
+        db.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Export interviews, with their questions and responses, as NDJSON",
+        epilog="Nightly incremental export: python -m app.export --watermark-file export.watermark -c gzip -o interviews.ndjson.gz"
+    )
+    parser.add_argument("-o", "--output", help="file to write (default: stdout)")
+    parser.add_argument("-c", "--compression", choices=COMPRESSIONS, default="none")
+    parser.add_argument("--from", dest="created_from", type=datetime.fromisoformat, help="created at or after (ISO 8601)")
+    parser.add_argument("--to", dest="created_to", type=datetime.fromisoformat, help="created before (ISO 8601)")
+    parser.add_argument("--after", type=datetime.fromisoformat, help="changed strictly after this watermark (ISO 8601, UTC)")
+    parser.add_argument(
+        "--watermark-file",
+        help="read --after from this file when it exists, and store the export's cutoff in it afterwards"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        check_compression(args.compression)
+    except ValueError as e:
+        parser.error(str(e))
+
+    after = args.after
+    if after is None and args.watermark_file:
+        try:
+            with open(args.watermark_file) as f:
+                after = datetime.fromisoformat(f.read().strip())
+        except FileNotFoundError:
+            pass
+
+    exported = 0
+    # Becomes the next watermark; only incremental runs stop at it, full and date-range runs export everything
+    until = export_cutoff()
+
+    def tracked(batches: Iterable[List[Dict[str, Any]]]) -> Iterator[List[Dict[str, Any]]]:
+        nonlocal exported
+        for batch in batches:
+            exported += len(batch)
+            yield batch
+
+    db = SessionLocal()
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        batches = iter_interview_batches(
+            db, args.created_from, args.created_to, after, until if after is not None else None, settings.export_batch_size
+        )
+        for chunk in compress(encode_ndjson(tracked(batches)), args.compression):
+            out.write(chunk)
+    finally:
+        db.close()
+        if args.output:
+            out.close()
+        else:
+            out.flush()
+
+    # Only advanced once the whole export is written, so a failed run is simply repeated
+    if args.watermark_file:
+        with open(args.watermark_file, "w") as f:
+            f.write(until.isoformat())
+    print(f"Exported {exported} interviews", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
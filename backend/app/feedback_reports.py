@@ -0,0 +1,84 @@
+import asyncio
+import hashlib
+import json
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from .config import settings
+from .models import FeedbackReport
+from .singleflight import redis_lock
+
+# Per-interview locks so concurrent first requests trigger a single generation
+_locks: Dict[int, asyncio.Lock] = {}
+_waiters: Dict[int, int] = {}
+
+
+def responses_fingerprint(interview_data: Dict[str, Any]) -> str:
+    """Hash the responses a report is generated from, so edits invalidate it"""
+    payload = json.dumps(interview_data.get("responses", []), sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_report(db: Session, interview_id: int, fingerprint: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Return the stored feedback if it was generated from the current responses
+    
+    Pass fingerprint=None to get the latest report regardless of freshness.
+    """
+    # populate_existing so a report saved by a concurrent request is seen
+    report = db.query(FeedbackReport).filter(
+        FeedbackReport.interview_id == interview_id
+    ).execution_options(populate_existing=True).first()
+    if not report or (fingerprint is not None and report.responses_fingerprint != fingerprint):
+        return None
+    return {
+        "overall_score": report.overall_score,
+        "summary": report.summary,
+        "strengths": report.strengths or [],
+        "improvements": report.improvements or [],
+        "recommendations": report.recommendations or []
+    }
+
+
+def save_report(db: Session, interview_id: int, fingerprint: str, feedback: Dict[str, Any]):
+    """Store generated feedback, replacing any stale report for the interview"""
+    report = db.query(FeedbackReport).filter(FeedbackReport.interview_id == interview_id).first()
+    if not report:
+        report = FeedbackReport(interview_id=interview_id)
+        db.add(report)
+    report.overall_score = feedback["overall_score"]
+    report.summary = feedback["summary"]
+    report.strengths = feedback["strengths"]
+    report.improvements = feedback["improvements"]
+    report.recommendations = feedback["recommendations"]
+    report.responses_fingerprint = fingerprint
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another worker stored a report first
+        db.rollback()
+
+
+@asynccontextmanager
+async def generation_lock(interview_id: int):
+    """Serialize feedback generation for one interview across workers
+
+    Requests in this process queue on a local lock, so only one of them at a
+    time waits on the Redis lock shared with the other workers.
+    """
+    lock = _locks.setdefault(interview_id, asyncio.Lock())
+    _waiters[interview_id] = _waiters.get(interview_id, 0) + 1
+    try:
+        async with lock:
+            async with redis_lock(
+                f"feedback:lock:{interview_id}",
+                ttl=settings.singleflight_lock_ttl,
+                wait_timeout=settings.singleflight_wait_timeout,
+                poll_interval=settings.singleflight_poll_interval
+            ):
+                yield
+    finally:
+        _waiters[interview_id] -= 1
+        if not _waiters[interview_id]:
+            del _waiters[interview_id]
+            del _locks[interview_id]
@@ -0,0 +1,154 @@
+import asyncio
+import hashlib
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from .config import settings
+from .database import open_session
+from .models import IdempotencyKey
+
+# Monotonic time this worker next deletes expired keys
+_next_purge = 0.0
+
+
+def request_fingerprint(data: Any) -> str:
+    """Hash of a request's parameters, to tell a retry from a different request reusing the key"""
+    return hashlib.sha256(json.dumps(jsonable_encoder(data), sort_keys=True).encode()).hexdigest()
+
+
+def _claim(db: Session, scope: str, key: str, request_hash: str) -> Optional[Dict[str, Any]]:
+    """Record the key as in progress; returns None when claimed, else the existing record"""
+    now = time.time()
+    db.add(IdempotencyKey(
+        scope=scope,
+        key=key,
+        request_hash=request_hash,
+        status="in_progress",
+        expires_at=now + settings.idempotency_lock_timeout
+    ))
+    try:
+        db.commit()
+        return None
+    except IntegrityError:
+        db.rollback()
+
+    record = db.query(IdempotencyKey).filter(
+        IdempotencyKey.scope == scope,
+        IdempotencyKey.key == key
+    ).with_for_update().first()
+    if record is None:
+        # Released by a failed first attempt in the meantime
+        return {"status": "released"}
+    if record.expires_at < now:
+        # Replay window over, or the first attempt's worker died: take the key over
+        record.request_hash = request_hash
+        record.status = "in_progress"
+        record.response_body = None
+        record.expires_at = now + settings.idempotency_lock_timeout
+        db.commit()
+        return None
+
+    existing = {"status": record.status, "request_hash": record.request_hash, "response_body": record.response_body}
+    db.commit()
+    return existing
+
+
+def _complete(db: Session, scope: str, key: str, body: Any):
+    db.query(IdempotencyKey).filter(IdempotencyKey.scope == scope, IdempotencyKey.key == key).update({
+        "status": "completed",
+        "response_body": body,
+        "expires_at": time.time() + settings.idempotency_ttl
+    }, synchronize_session=False)
+    db.commit()
+
+
+def _purge_expired(db: Session) -> int:
+    """Delete keys whose replay window, or abandoned in-progress lock, is over"""
+    deleted = db.query(IdempotencyKey).filter(IdempotencyKey.expires_at < time.time()).delete(
+        synchronize_session=False
+    )
+    db.commit()
+    return deleted
+
+
+def _release(db: Session, scope: str, key: str):
+    db.query(IdempotencyKey).filter(IdempotencyKey.scope == scope, IdempotencyKey.key == key).delete(
+        synchronize_session=False
+    )
+    db.commit()
+
+
+async def run_idempotent(
+    scope: str,
+    key: Optional[str],
+    request_data: Any,
+    fn: Callable[[], Awaitable[Any]]
+) -> Tuple[Any, bool]:
+    """Run fn at most once per (scope, key), returning (result, replayed)
+
+    A retry with the same key gets the stored result of the first execution,
+    waiting for it while that execution is still running. If the first
+    execution fails, the key is released so a retry runs again. Without a key,
+    fn simply runs.
+    """
+    if key is None:
+        return await fn(), False
+    if not key or len(key) > 255:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Idempotency-Key must be 1 to 255 characters"
+        )
+
+    request_hash = request_fingerprint(request_data)
+    deadline = time.monotonic() + settings.idempotency_wait_timeout
+    while True:
+        async with open_session() as db:
+            existing = await db.run(_claim, scope, key, request_hash)
+        if existing is None:
+            break
+        if existing["status"] == "released":
+            continue
+        if existing["request_hash"] != request_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used for a different request"
+            )
+        if existing["status"] == "completed":
+            return existing["response_body"], True
+        if time.monotonic() >= deadline:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still being processed"
+            )
+        await asyncio.sleep(settings.idempotency_poll_interval)
+
+    try:
+        result = await fn()
+    except BaseException:
+        # Includes cancellation when the client disconnects: let the retry run
+        async with open_session() as db:
+            await db.run(_release, scope, key)
+        raise
+
+    body = jsonable_encoder(result)
+    async with open_session() as db:
+        await db.run(_complete, scope, key, body)
+    await _purge_if_due()
+    return body, False
+
+
+async def _purge_if_due():
+    # Expired keys are ignored by _claim, so this only keeps the table from growing
+    global _next_purge
+    if time.monotonic() < _next_purge:
+        return
+    _next_purge = time.monotonic() + settings.idempotency_purge_interval
+    try:
+        async with open_session() as db:
+            await db.run(_purge_expired)
+    except Exception as e:
+        print(f"Error purging expired idempotency keys: {e}")
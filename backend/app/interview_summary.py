@@ -0,0 +1,84 @@
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from .config import settings
+from .models import Interview, Question, Response
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+def empty_summary() -> Dict[str, Any]:
+    return {"answered": 0, "by_type": {}, "notes": []}
+
+
+def distill_note(evaluation: Dict[str, Any]) -> str:
+    """One short takeaway for an answer: the evaluator's note, else the first sentence of its feedback"""
+    note = (evaluation.get("note") or "").strip()
+    if not note:
+        feedback = (evaluation.get("feedback") or "").strip()
+        note = SENTENCE_END.split(feedback, maxsplit=1)[0] if feedback else ""
+    limit = settings.summary_note_chars
+    return note if len(note) <= limit else note[:limit - 1].rstrip() + "…"
+
+
+def add_evaluation(summary: Optional[Dict[str, Any]], question_type: str, order_index: int, evaluation: Dict[str, Any]) -> Dict[str, Any]:
+    """Fold one evaluated answer into a summary, returning a new summary of bounded size"""
+    summary = summary or empty_summary()
+    score = evaluation.get("score")
+
+    by_type = {name: dict(stats) for name, stats in summary["by_type"].items()}
+    if score is not None:
+        stats = by_type.setdefault(question_type, {"count": 0, "total": 0.0, "min": score, "max": score})
+        stats["count"] += 1
+        stats["total"] += score
+        stats["min"] = min(stats["min"], score)
+        stats["max"] = max(stats["max"], score)
+
+    notes = list(summary["notes"])
+    note = distill_note(evaluation)
+    if note:
+        notes.append({"order_index": order_index, "type": question_type, "score": score, "note": note})
+    if len(notes) > settings.summary_max_notes:
+        # Keep the strongest and weakest answers: drop an unscored note, else the one closest to the average
+        scored = [n for n in notes if n["score"] is not None]
+        mean = sum(n["score"] for n in scored) / len(scored) if scored else 0.0
+        notes.remove(min(notes, key=lambda n: abs(n["score"] - mean) if n["score"] is not None else -1))
+    notes.sort(key=lambda n: n["order_index"])
+
+    return {"answered": summary["answered"] + 1, "by_type": by_type, "notes": notes}
+
+
+def build_summary(rows: Iterable[Tuple[Response, Question]]) -> Dict[str, Any]:
+    """Rebuild a summary from stored evaluations"""
+    summary = empty_summary()
+    for response, question in rows:
+        if response.evaluation_status != "completed":
+            continue
+        summary = add_evaluation(summary, question.question_type, question.order_index, {
+            "score": response.score,
+            "feedback": response.ai_feedback
+        })
+    return summary
+
+
+def update_running_summary(db: Session, interview_id: int, question_type: str, order_index: int, evaluation: Dict[str, Any]):
+    """Add an evaluation to the interview's running summary; the caller commits"""
+    # Row lock so concurrent background evaluations of one interview don't lose updates
+    interview = db.query(Interview).filter(Interview.id == interview_id).with_for_update().first()
+    if interview is not None:
+        interview.running_summary = add_evaluation(interview.running_summary, question_type, order_index, evaluation)
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    """Render a summary for the feedback prompt"""
+    lines: List[str] = [f"Questions answered: {summary['answered']}", "Scores by question type:"]
+    for name, stats in sorted(summary["by_type"].items()):
+        average = stats["total"] / stats["count"]
+        lines.append(
+            f"- {name}: average {average:.1f}/10 over {stats['count']} answers (lowest {stats['min']:g}, highest {stats['max']:g})"
+        )
+    lines.append("Notes on individual answers:")
+    for note in summary["notes"]:
+        score = f"{note['score']:g}/10" if note["score"] is not None else "unscored"
+        lines.append(f"- Q{note['order_index']} ({note['type']}, {score}): {note['note']}")
+    return "\n".join(lines)
@@ -0,0 +1,204 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import AsyncIterator, Dict, List, Optional
+from .config import settings
+from .metrics import LLM_QUEUE_WAIT
+
+# Rough token estimate for English prompts; reconciled with reported usage after each call
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+class Priority(IntEnum):
+    """Lower values are served first"""
+    INTERACTIVE = 0  # answer evaluations a candidate is waiting on
+    STANDARD = 1  # question generation and embeddings
+    BULK = 2  # feedback reports
+
+
+def estimate_tokens(*texts: str) -> int:
+    """Estimate prompt tokens before sending a request"""
+    return sum(len(text) // CHARS_PER_TOKEN + MESSAGE_OVERHEAD_TOKENS for text in texts)
+
+
+class TokenBucket:
+    """Per-minute budget that refills continuously"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+
+    def wait_time(self, amount: float, now: float, factor: float) -> float:
+        """Seconds until amount is available at the current refill rate"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate * factor)
+        self.updated = now
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / (self.rate * factor)
+
+    def consume(self, amount: float):
+        # May go negative when a call used more than was reserved
+        self.tokens -= amount
+
+    def refund(self, amount: float):
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    tokens: int = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    enqueued_at: float = field(compare=False)
+
+
+@dataclass
+class Grant:
+    """A reserved slot; set used_tokens from the API response to reconcile the budget"""
+    reserved_tokens: int
+    used_tokens: Optional[int] = None
+
+
+class LLMScheduler:
+    """Admit LLM calls in priority order within request, token and concurrency limits
+
+    Limits are per process. A rate-limit response pauses all admissions and
+    halves the effective refill rate, which then recovers gradually as calls
+    succeed again.
+    """
+
+    def __init__(self, rpm: int, tpm: int, max_concurrency: int, backoff: float, backoff_max: float):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_concurrency = max_concurrency
+        self.base_backoff = backoff
+        self.backoff_max = backoff_max
+        self._backoff = backoff
+        self._rate_factor = 1.0
+        self._paused_until = 0.0
+        self._in_flight = 0
+        self._queue: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.stats: Dict[str, int] = {"granted": 0, "rate_limited": 0}
+        self.queue_wait: Dict[str, Dict[str, float]] = {
+            priority.name.lower(): {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            for priority in Priority
+        }
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority, estimated_tokens: int) -> AsyncIterator[Grant]:
+        """Wait for permission to make one call"""
+        # A single call can never need more than a full bucket
+        grant = Grant(min(estimated_tokens, int(self.tokens.capacity)))
+        waiter = _Waiter(
+            priority,
+            next(self._seq),
+            grant.reserved_tokens,
+            asyncio.get_running_loop().create_future(),
+            time.monotonic()
+        )
+        heapq.heappush(self._queue, waiter)
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            # Cancelled right after being admitted: give the slot back
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._release(grant)
+            raise
+
+        try:
+            yield grant
+            self._on_success()
+        finally:
+            self._release(grant)
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        now = time.monotonic()
+        while self._queue:
+            waiter = self._queue[0]
+            if waiter.future.done():
+                # Cancelled while queued
+                heapq.heappop(self._queue)
+                continue
+            if self._in_flight >= self.max_concurrency:
+                return  # the next release dispatches again
+
+            delay = max(
+                self._paused_until - now,
+                self.requests.wait_time(1, now, self._rate_factor),
+                self.tokens.wait_time(waiter.tokens, now, self._rate_factor)
+            )
+            if delay > 0:
+                self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+                return
+
+            heapq.heappop(self._queue)
+            self.requests.consume(1)
+            self.tokens.consume(waiter.tokens)
+            self._in_flight += 1
+            self.stats["granted"] += 1
+            self._record_wait(waiter, now)
+            waiter.future.set_result(None)
+
+    def _record_wait(self, waiter: _Waiter, now: float):
+        waited = now - waiter.enqueued_at
+        metrics = self.queue_wait[Priority(waiter.priority).name.lower()]
+        metrics["count"] += 1
+        metrics["total_seconds"] += waited
+        metrics["max_seconds"] = max(metrics["max_seconds"], waited)
+        LLM_QUEUE_WAIT.labels(Priority(waiter.priority).name.lower()).observe(waited)
+
+    def _release(self, grant: Grant):
+        self._in_flight -= 1
+        if grant.used_tokens is not None:
+            difference = grant.reserved_tokens - grant.used_tokens
+            if difference > 0:
+                self.tokens.refund(difference)
+            else:
+                self.tokens.consume(-difference)
+        self._dispatch()
+
+    def _on_success(self):
+        self._backoff = self.base_backoff
+        self._rate_factor = min(1.0, self._rate_factor + 0.05)
+
+    def on_rate_limited(self, retry_after: Optional[float] = None):
+        """Back off after the API reports that a rate limit was hit"""
+        self.stats["rate_limited"] += 1
+        self._rate_factor = max(0.1, self._rate_factor / 2)
+        pause = retry_after if retry_after is not None else self._backoff
+        self._backoff = min(self._backoff * 2, self.backoff_max)
+        self._paused_until = max(self._paused_until, time.monotonic() + pause)
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            **self.stats,
+            "queued": sum(1 for waiter in self._queue if not waiter.future.done()),
+            "in_flight": self._in_flight,
+            "rate_factor": round(self._rate_factor, 3),
+            "paused_seconds": round(max(0.0, self._paused_until - time.monotonic()), 3),
+            "queue_wait": self.queue_wait
+        }
+
+
+llm_scheduler = LLMScheduler(
+    rpm=settings.llm_rpm_limit,
+    tpm=settings.llm_tpm_limit,
+    max_concurrency=settings.llm_max_concurrency,
+    backoff=settings.llm_rate_limit_backoff,
+    backoff_max=settings.llm_rate_limit_backoff_max
+)
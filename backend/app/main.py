@@ -1,17 +1,44 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from .config import settings
+from fastapi.concurrency import run_in_threadpool
+from .ai_service import close_ai_service
+from .batch_jobs import batch_jobs
+from .cache import question_cache
+from .singleflight import question_flight
+from .llm_scheduler import llm_scheduler
+from .metrics import MetricsMiddleware
+from .prescorer import prescorer
+from .question_generation import question_generations
 from .database import engine
 from .models import Base
-from .routers import interviews
+from .redis_client import close_redis
+from .routers import audio, batches, export, interviews, sessions
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Importing the app never touches the database; tables are created here or by migrations
+    if settings.create_tables_on_startup:
+        await run_in_threadpool(Base.metadata.create_all, bind=engine)
+    if settings.prescore_enabled:
+        prescorer.warm_up()
+    yield
+    # Let question generations and batch jobs under way finish, then release pooled LLM and Redis connections
+    await question_generations.drain(settings.question_wait_timeout)
+    await batch_jobs.drain(settings.question_wait_timeout)
+    await close_ai_service()
+    await close_redis()
+    prescorer.shutdown()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title=settings.app_name,
     description="AI-powered mock interview platform",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -21,10 +48,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Idempotent-Replayed"],
 )
 
+# Outermost, so latency covers CORS handling too
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(interviews.router)
+app.include_router(audio.router)
+app.include_router(sessions.router)
+app.include_router(batches.router)
+app.include_router(export.router)
 
 
 @app.get("/")
@@ -38,4 +73,23 @@ def read_root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"} 
\ No newline at end of file
+    return {"status": "healthy"} 
+
+
+@app.get("/stats")
+def get_stats():
+    from .question_bank import question_bank
+    return {
+        "question_cache": question_cache.stats,
+        "question_bank": {**question_bank.stats, "size": len(question_bank)},
+        "question_singleflight": question_flight.stats,
+        "llm_scheduler": llm_scheduler.snapshot(),
+        "prescorer": prescorer.stats,
+        "question_generations": question_generations.stats,
+        "batch_jobs": batch_jobs.stats
+    }
+
+
+@app.get("/metrics")
+def get_metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,207 @@
+import json
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from .config import settings
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency, until the last body chunk is sent",
+    ["method", "route", "status"]
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed per HTTP request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL per HTTP request",
+    ["route"]
+)
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time",
+    ["engine"]
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the pool",
+    ["engine"]
+)
+LLM_LATENCY = Histogram(
+    "llm_request_duration_seconds",
+    "LLM API call latency per AIService operation",
+    ["operation"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Tokens reported by the LLM API",
+    ["operation", "kind"]
+)
+LLM_QUEUE_WAIT = Histogram(
+    "llm_scheduler_queue_wait_seconds",
+    "Time LLM calls wait for a scheduler slot",
+    ["priority"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+)
+LLM_CALLS_AVOIDED = Counter(
+    "llm_calls_avoided_total",
+    "Answer evaluations settled by the local pre-scorer without an LLM call"
+)
+LLM_ERRORS = Counter(
+    "llm_errors_total",
+    "Failed LLM API calls",
+    ["operation", "error"]
+)
+
+
+@dataclass
+class RequestTimings:
+    """Per-request totals, shared with the threadpool and run_sync through a context variable"""
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    llm_calls: int = 0
+    llm_seconds: float = 0.0
+
+
+_request_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def record_llm_call(operation: str, seconds: float, usage: Any = None, error: Optional[Exception] = None):
+    """Record one LLM API call made on behalf of an AIService operation"""
+    LLM_LATENCY.labels(operation).observe(seconds)
+    if usage is not None:
+        LLM_TOKENS.labels(operation, "prompt").inc(usage.prompt_tokens or 0)
+        LLM_TOKENS.labels(operation, "completion").inc(getattr(usage, "completion_tokens", 0) or 0)
+    if error is not None:
+        LLM_ERRORS.labels(operation, type(error).__name__).inc()
+
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.llm_calls += 1
+        timings.llm_seconds += seconds
+
+
+def instrument_engine(engine, name: str):
+    """Time every statement executed on a sync engine (or an async engine's sync_engine)"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        DB_QUERY_LATENCY.labels(name).observe(elapsed)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.db_queries += 1
+            timings.db_seconds += elapsed
+
+    DB_POOL_CHECKED_OUT.labels(name).set_function(lambda: engine.pool.checkedout() if hasattr(engine.pool, "checkedout") else 0)
+
+
+def timed_pool_class(pool_class, name: str):
+    """Subclass a queue pool so that waiting for a free connection is measured"""
+
+    class TimedPool(pool_class):
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                return super()._do_get()
+            finally:
+                DB_POOL_CHECKOUT_WAIT.labels(name).observe(time.perf_counter() - start)
+
+    TimedPool.__name__ = f"Timed{pool_class.__name__}"
+    return TimedPool
+
+
+TimedQueuePool = timed_pool_class(QueuePool, "sync")
+TimedAsyncAdaptedQueuePool = timed_pool_class(AsyncAdaptedQueuePool, "async")
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency and database/LLM time per route"""
+
+    def __init__(self, app):
+        self.app = app
+        self._route_paths: Dict[Any, str] = {}
+
+    def _route_path(self, scope) -> str:
+        # Label by route template, not raw path, to keep label cardinality bounded
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        if endpoint not in self._route_paths:
+            for route in scope["app"].routes:
+                if getattr(route, "endpoint", None) is endpoint:
+                    self._route_paths[endpoint] = route.path
+                    break
+            else:
+                self._route_paths[endpoint] = getattr(endpoint, "__name__", "unknown")
+        return self._route_paths[endpoint]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _request_timings.set(timings)
+        start = time.perf_counter()
+        status_code = 500
+        finished = False
+
+        def finish():
+            nonlocal finished
+            if finished:
+                return
+            finished = True
+            self._observe(scope, status_code, time.perf_counter() - start, timings)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+            # Stop the clock at the last body chunk so background tasks are not counted
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                finish()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            finish()
+            _request_timings.reset(token)
+
+    def _observe(self, scope, status_code: int, seconds: float, timings: RequestTimings):
+        route = self._route_path(scope)
+        REQUEST_LATENCY.labels(scope["method"], route, str(status_code)).observe(seconds)
+        REQUEST_DB_QUERIES.labels(route).observe(timings.db_queries)
+        REQUEST_DB_SECONDS.labels(route).observe(timings.db_seconds)
+
+        if settings.timing_logs:
+            print(json.dumps({
+                "event": "request_timing",
+                "method": scope["method"],
+                "route": route,
+                "status": status_code,
+                "duration_ms": round(seconds * 1000, 2),
+                "db_queries": timings.db_queries,
+                "db_ms": round(timings.db_seconds * 1000, 2),
+                "llm_calls": timings.llm_calls,
+                "llm_ms": round(timings.llm_seconds * 1000, 2)
+            }), flush=True)
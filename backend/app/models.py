@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
@@ -17,6 +17,10 @@ class User(Base):
 
 class Interview(Base):
     __tablename__ = "interviews"
+    __table_args__ = (
+        # Keyset pagination of a user's history on (created_at, id)
+        Index("ix_interviews_user_id_created_at", "user_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -26,14 +30,22 @@ class Interview(Base):
     status = Column(String, default="created")  # created, in_progress, completed
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
+    running_summary = Column(JSON, nullable=True)  # score aggregates and notes, updated after each evaluation
+    question_status = Column(String, default="ready", server_default="ready")  # generating, ready, failed
+    # Last change to the interview row itself; responses track their own, and both drive incremental exports
+    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now(), index=True)
     
     user = relationship("User", back_populates="interviews")
-    questions = relationship("Question", back_populates="interview")
-    responses = relationship("Response", back_populates="interview")
+    questions = relationship("Question", back_populates="interview", order_by="Question.order_index")
+    responses = relationship("Response", back_populates="interview", order_by="Response.id")
+    feedback_report = relationship("FeedbackReport", back_populates="interview", uselist=False)
 
 
 class Question(Base):
     __tablename__ = "questions"
+    __table_args__ = (
+        Index("ix_questions_interview_id_order_index", "interview_id", "order_index"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     interview_id = Column(Integer, ForeignKey("interviews.id"))
@@ -48,14 +60,50 @@ class Question(Base):
 
 class Response(Base):
     __tablename__ = "responses"
+    __table_args__ = (
+        # One answer per question; also serves lookups by interview_id
+        Index("uq_responses_interview_id_question_id", "interview_id", "question_id", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     interview_id = Column(Integer, ForeignKey("interviews.id"))
     question_id = Column(Integer, ForeignKey("questions.id"))
     response_text = Column(Text)
     ai_feedback = Column(Text, nullable=True)
+    suggestions = Column(JSON, nullable=True)
     score = Column(Float, nullable=True)
+    evaluation_status = Column(String, default="completed")  # pending, completed, failed
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Set by the insert and by every evaluation write, so they need no extra statement on the interview
+    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now(), index=True)
     
     interview = relationship("Interview", back_populates="responses")
-    question = relationship("Question", back_populates="responses") 
\ No newline at end of file
+    question = relationship("Question", back_populates="responses")
+
+
+class FeedbackReport(Base):
+    __tablename__ = "feedback_reports"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    interview_id = Column(Integer, ForeignKey("interviews.id"), unique=True)
+    overall_score = Column(Float)
+    summary = Column(Text)
+    strengths = Column(JSON)
+    improvements = Column(JSON)
+    recommendations = Column(JSON)
+    responses_fingerprint = Column(String)  # hash of the responses the report was generated from
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    interview = relationship("Interview", back_populates="feedback_report")
+
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+    
+    scope = Column(String, primary_key=True)  # endpoint and owner the key applies to
+    key = Column(String, primary_key=True)
+    request_hash = Column(String)
+    status = Column(String, default="in_progress")  # in_progress, completed
+    response_body = Column(JSON, nullable=True)
+    expires_at = Column(Float, index=True)  # unix time: end of the in-progress lock, then of the replay window
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,191 @@
+import asyncio
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+from .config import settings
+from .metrics import LLM_CALLS_AVOIDED
+
+WORD = re.compile(r"[a-z0-9']+")
+
+# Phrases that signal each part of a STAR (situation, task, action, result) answer
+STAR_MARKERS = {
+    "situation": ("situation", "context", "background", "at the time", "in my last", "in my previous", "when i was"),
+    "task": ("task", "goal", "responsible", "needed to", "challenge", "objective", "deadline"),
+    "action": ("i led", "i built", "i decided", "i implemented", "i designed", "i created", "i organized", "i worked", "so i", "my approach"),
+    "result": ("result", "outcome", "reduced", "increased", "improved", "saved", "delivered", "learned", "%"),
+}
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "describe", "do", "does", "for", "from", "had", "have", "how",
+    "i", "in", "is", "it", "me", "of", "on", "or", "that", "the", "this", "time", "to", "was", "we", "what", "when",
+    "where", "which", "who", "why", "with", "would", "you", "your", "tell", "about", "can", "did", "our", "they"
+}
+
+INSUFFICIENT_FEEDBACK = {
+    "too_short": "This answer is too short to evaluate. Interviewers expect a complete answer of at least a few sentences.",
+    "not_text": "This answer doesn't read as written prose, so it couldn't be evaluated.",
+    "repetitive": "This answer mostly repeats the same words, so it couldn't be evaluated.",
+}
+
+
+def _keywords(text: str) -> Set[str]:
+    return {w for w in WORD.findall(text.lower()) if w not in STOPWORDS and len(w) > 2}
+
+
+def extract_features(question: str, response: str, context: str) -> List[float]:
+    """Cheap per-answer features: length, character mix, repetition, STAR coverage, topical overlap"""
+    text = response.lower()
+    words = WORD.findall(text)
+    visible = [ch for ch in response if not ch.isspace()]
+    keywords = _keywords(question) | _keywords(context)
+    return [
+        len(words),
+        sum(ch.isalpha() for ch in visible) / len(visible) if visible else 0.0,
+        len(set(words)) / len(words) if words else 0.0,
+        sum(any(marker in text for marker in markers) for markers in STAR_MARKERS.values()) / len(STAR_MARKERS),
+        len(keywords & set(words)) / len(keywords) if keywords else 0.0,
+        1.0 if any(ch.isdigit() for ch in text) else 0.0,
+    ]
+
+
+def score_batch(items: List[Tuple[str, str, str]], thresholds: Dict[str, float]) -> List[Dict[str, Any]]:
+    """Score a batch of (question, response, context) at once; runs in the process pool"""
+    import numpy as np
+
+    features = np.array([extract_features(*item) for item in items], dtype=np.float64).reshape(-1, 6)
+    words, alpha, unique, star, overlap, numbers = features.T
+
+    length = np.clip(np.log1p(words) / np.log1p(150), 0.0, 1.0)
+    variety = np.clip(unique * 2, 0.0, 1.0)
+    quality = 0.35 * length + 0.25 * star + 0.2 * overlap + 0.1 * numbers + 0.1 * variety
+    scores = 1.0 + 9.0 * np.clip(quality, 0.0, 1.0)
+
+    too_short = words < thresholds["min_words"]
+    not_text = alpha < thresholds["min_alpha_ratio"]
+    repetitive = (words >= thresholds["repetitive_min_words"]) & (unique < thresholds["min_unique_ratio"])
+    insufficient = too_short | not_text | repetitive
+    scores = np.where(insufficient, np.minimum(scores, 2.0), scores)
+
+    results = []
+    for i in range(len(items)):
+        reasons = [
+            name for name, flags in (("too_short", too_short), ("not_text", not_text), ("repetitive", repetitive))
+            if flags[i]
+        ]
+        results.append({
+            "score": round(float(scores[i]), 1),
+            "insufficient": bool(insufficient[i]),
+            "reasons": reasons
+        })
+    return results
+
+
+def insufficient_evaluation(prescore: Dict[str, Any]) -> Dict[str, Any]:
+    """The evaluation given to an answer the pre-scorer rejected, without calling the LLM"""
+    return {
+        "score": prescore["score"],
+        "feedback": " ".join(INSUFFICIENT_FEEDBACK[reason] for reason in prescore["reasons"]),
+        "suggestions": [
+            "Answer with a specific example from your experience",
+            "Use the STAR method: situation, task, action, result",
+            "Relate your answer to the question that was asked"
+        ],
+        "note": "Answer too thin to evaluate"
+    }
+
+
+class PreScorer:
+    """Local first-pass answer scoring, batched and run in a process pool
+
+    Calls arriving within a short window are scored together, so the NumPy
+    scoring is vectorized across concurrent answers and the string work stays
+    off the event loop.
+    """
+
+    def __init__(self, workers: int, batch_window: float, max_batch: int):
+        self.workers = workers
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending: List[Tuple[Tuple[str, str, str], asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.stats: Dict[str, int] = {"scored": 0, "llm_avoided": 0}
+
+    @staticmethod
+    def _thresholds() -> Dict[str, float]:
+        return {
+            "min_words": settings.prescore_min_words,
+            "min_alpha_ratio": settings.prescore_min_alpha_ratio,
+            "min_unique_ratio": settings.prescore_min_unique_ratio,
+            "repetitive_min_words": settings.prescore_repetitive_min_words
+        }
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a process that already runs threads can deadlock
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    def warm_up(self):
+        """Start the worker processes in the background so the first answer doesn't wait for them"""
+        if self.workers > 0:
+            self._get_executor().submit(score_batch, [], self._thresholds())
+
+    async def score(self, question: str, response: str, context: Optional[str] = None) -> Dict[str, Any]:
+        """Return {"score", "insufficient", "reasons"} for one answer"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(((question, response, context or ""), future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[Tuple[str, str, str], asyncio.Future]]):
+        items = [item for item, _ in batch]
+        try:
+            if self.workers > 0:
+                results = await asyncio.get_running_loop().run_in_executor(
+                    self._get_executor(), score_batch, items, self._thresholds()
+                )
+            else:
+                results = score_batch(items, self._thresholds())
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.stats["scored"] += len(batch)
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def record_llm_avoided(self):
+        self.stats["llm_avoided"] += 1
+        LLM_CALLS_AVOIDED.inc()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+prescorer = PreScorer(
+    workers=settings.prescore_workers,
+    batch_window=settings.prescore_batch_window,
+    max_batch=settings.prescore_max_batch
+)
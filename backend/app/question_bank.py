@@ -0,0 +1,240 @@
+import fcntl
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from .config import settings
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+")
+
+
+class HashingEmbedder:
+    """Offline embedder: signed feature hashing of word unigrams and bigrams"""
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def _features(self, text: str) -> List[str]:
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        features = self._features(text)
+        if not features:
+            return vector
+
+        hashes = np.array(
+            [int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=8).digest(), "little") for f in features],
+            dtype=np.uint64
+        )
+        indexes = (hashes % np.uint64(self.dim)).astype(np.int64)
+        signs = np.where(hashes >> np.uint64(63), 1.0, -1.0).astype(np.float32)
+        np.add.at(vector, indexes, signs)
+
+        # Sublinear term frequency, then unit length so dot product is cosine similarity
+        vector = np.sign(vector) * np.log1p(np.abs(vector))
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+def normalize(vector: np.ndarray) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class QuestionBank:
+    """Persistent nearest-neighbour index of generated question sets
+
+    Vectors are appended to a raw float32 file that is memory-mapped for search;
+    the matching question sets are appended to a JSON-lines file. Appends are
+    serialized across processes with a file lock, and every process picks up
+    rows added by others on its next lookup. Small banks are searched by brute
+    force; larger ones through an inverted-file (IVF) index that is rebuilt
+    whenever the bank doubles in size.
+    """
+
+    def __init__(self, directory: str, dim: int, ivf_min_size: int, ivf_probes: int):
+        self.directory = directory
+        self.dim = dim
+        self.ivf_min_size = ivf_min_size
+        self.ivf_probes = ivf_probes
+        self._vectors_path = os.path.join(directory, "vectors.f32")
+        self._entries_path = os.path.join(directory, "entries.jsonl")
+        self._lock_path = os.path.join(directory, ".lock")
+        self._lock = threading.Lock()
+        self._vectors: Optional[np.ndarray] = None
+        self._entries: List[Dict[str, Any]] = []
+        self._entries_offset = 0
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[List[int]] = []
+        self._indexed = 0
+        self._built_at = 0
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "added": 0}
+
+    @property
+    def _row_bytes(self) -> int:
+        return self.dim * 4
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _refresh(self):
+        """Map rows appended since the last refresh, by this or another process"""
+        if not os.path.exists(self._vectors_path) or not os.path.exists(self._entries_path):
+            return
+
+        # Entries are written before their vector, so complete vectors bound the row count
+        available = os.path.getsize(self._vectors_path) // self._row_bytes
+        if available <= len(self._entries):
+            return
+
+        with open(self._entries_path, "rb") as f:
+            f.seek(self._entries_offset)
+            while len(self._entries) < available:
+                line = f.readline()
+                if not line.endswith(b"\n"):
+                    break
+                self._entries.append(json.loads(line))
+                self._entries_offset = f.tell()
+
+        count = len(self._entries)
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(count, self.dim))
+        self._update_index()
+
+    def _update_index(self):
+        count = len(self._entries)
+        if count < self.ivf_min_size:
+            return
+        if self._centroids is None or count >= 2 * self._built_at:
+            self._build_index()
+            return
+
+        # Incremental update: route new rows to their nearest existing centroid
+        new_rows = np.asarray(self._vectors[self._indexed:count])
+        for offset, list_id in enumerate(np.argmax(new_rows @ self._centroids.T, axis=1)):
+            self._lists[list_id].append(self._indexed + offset)
+        self._indexed = count
+
+    def _build_index(self, iterations: int = 10, sample_size: int = 20000):
+        """Cluster the bank with spherical k-means and build the inverted lists"""
+        count = len(self._entries)
+        n_lists = max(1, int(np.sqrt(count)))
+        rng = np.random.default_rng(0)
+        sample_ids = rng.choice(count, size=min(count, sample_size), replace=False)
+        sample = np.asarray(self._vectors[np.sort(sample_ids)])
+
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)]
+        for _ in range(iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Keep the previous centroid for lists that ended up empty
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+
+        lists: List[List[int]] = [[] for _ in range(n_lists)]
+        for start in range(0, count, 8192):
+            block = np.asarray(self._vectors[start:start + 8192])
+            for offset, list_id in enumerate(np.argmax(block @ centroids.T, axis=1)):
+                lists[list_id].append(start + offset)
+
+        self._centroids = centroids.astype(np.float32)
+        self._lists = lists
+        self._indexed = count
+        self._built_at = count
+
+    def _candidates(self, query: np.ndarray) -> Optional[np.ndarray]:
+        if self._centroids is None:
+            return None
+        probes = np.argsort(self._centroids @ query)[::-1][:self.ivf_probes]
+        ids = [np.asarray(self._lists[p], dtype=np.int64) for p in probes]
+        return np.concatenate(ids) if ids else np.empty(0, dtype=np.int64)
+
+    def search(self, vector: np.ndarray, k: int = 5) -> List[Tuple[float, Dict[str, Any]]]:
+        """Return up to k (similarity, entry) pairs, most similar first"""
+        query = normalize(vector)
+        with self._lock:
+            self._refresh()
+            if not self._entries:
+                return []
+
+            candidates = self._candidates(query)
+            if candidates is None:
+                scores = np.asarray(self._vectors) @ query
+                ids = np.arange(len(scores))
+            else:
+                scores = np.asarray(self._vectors[candidates]) @ query
+                ids = candidates
+            if not len(scores):
+                return []
+
+            top = np.argpartition(-scores, min(k, len(scores)) - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(float(scores[i]), self._entries[ids[i]]) for i in top]
+
+    def find(self, vector: np.ndarray, threshold: float, prompt_version: str) -> Optional[Tuple[float, List[Dict[str, Any]]]]:
+        """Return the closest question set at or above the similarity threshold"""
+        for score, entry in self.search(vector):
+            if score < threshold:
+                break
+            if entry.get("prompt_version") == prompt_version:
+                self.stats["hits"] += 1
+                return score, entry["questions"]
+        self.stats["misses"] += 1
+        return None
+
+    def add(self, vector: np.ndarray, job_title: str, questions: List[Dict[str, Any]], prompt_version: str):
+        """Append a question set to the bank and make it searchable"""
+        os.makedirs(self.directory, exist_ok=True)
+        line = json.dumps({
+            "job_title": job_title,
+            "prompt_version": prompt_version,
+            "questions": questions
+        }).encode("utf-8") + b"\n"
+        row = normalize(vector).astype(np.float32).tobytes()
+
+        with self._lock, open(self._lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._refresh()
+                # Drop anything past the last complete row left behind by an interrupted append
+                with open(self._entries_path, "ab") as entries:
+                    entries.truncate(self._entries_offset)
+                    entries.write(line)
+                with open(self._vectors_path, "ab") as vectors:
+                    vectors.truncate(len(self._entries) * self._row_bytes)
+                    vectors.write(row)
+                self._refresh()
+                self.stats["added"] += 1
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def reshuffle(questions: List[Dict[str, Any]], rng: Optional[np.random.Generator] = None) -> List[Dict[str, Any]]:
+    """Shuffle questions within each type, keeping each type in its original slots"""
+    rng = rng or np.random.default_rng()
+    ordered = sorted(questions, key=lambda q: q["order_index"])
+    by_type: Dict[str, List[Dict[str, Any]]] = {}
+    for question in ordered:
+        by_type.setdefault(question["question_type"], []).append(question)
+    for group in by_type.values():
+        rng.shuffle(group)
+
+    return [
+        {**by_type[question["question_type"]].pop(), "order_index": question["order_index"]}
+        for question in ordered
+    ]
+
+
+hashing_embedder = HashingEmbedder(settings.question_bank_dim)
+question_bank = QuestionBank(
+    os.path.join(settings.question_bank_dir, settings.question_bank_embedder),
+    settings.question_bank_dim,
+    ivf_min_size=settings.question_bank_ivf_min_size,
+    ivf_probes=settings.question_bank_ivf_probes
+)
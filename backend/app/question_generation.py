@@ -0,0 +1,119 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Set, Tuple
+from .ai_service import get_ai_service
+from .config import settings
+from .crud import add_questions, set_question_status
+from .database import open_session
+from .tts_service import tts_service
+
+
+class _Generation:
+    def __init__(self):
+        self.questions: List[Dict[str, Any]] = []  # saved
+        self.pending: List[Dict[str, Any]] = []  # parsed, waiting to be saved
+        self.status = "generating"
+        self.changed = asyncio.Event()
+
+    def notify(self):
+        # A fresh event per change, so every waiter is woken exactly once
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+
+class QuestionGenerations:
+    """Interviews whose questions are being generated by this process
+
+    Questions are saved and committed as the LLM produces them, so an
+    interview can start while the rest of its questions are still on the way. Waiters in this process are woken as each question is saved; other
+    processes find the questions by polling the database.
+    """
+
+    def __init__(self):
+        self._generations: Dict[int, _Generation] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def start(self, interview_id: int, job_description: str, job_title: str) -> Tuple[List[Dict[str, Any]], str]:
+        """Start generating questions for a saved interview
+
+        Returns once the first questions are saved (or generation has ended)
+        with the questions saved so far and the generation status; the rest
+        are added in the background.
+        """
+        generation = _Generation()
+        self._generations[interview_id] = generation
+        task = asyncio.create_task(self._run(interview_id, job_description, job_title, generation))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+        while not generation.questions and generation.status == "generating":
+            await generation.changed.wait()
+        return list(generation.questions), generation.status
+
+    async def wait(self, interview_id: int, timeout: float):
+        """Wait until this process saves another question for the interview, at most `timeout` seconds"""
+        generation = self._generations.get(interview_id)
+        if generation is None:
+            # Generated elsewhere (or already finished): the caller re-reads the database
+            await asyncio.sleep(timeout)
+            return
+        try:
+            await asyncio.wait_for(generation.changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _write(self, interview_id: int, generation: _Generation):
+        # Questions parsed while a batch is being written go out together in the next one.
+        # Each batch is a short transaction: no connection is held while the LLM is generating.
+        while generation.pending:
+            batch, generation.pending = generation.pending, []
+            async with open_session() as db:
+                saved = await db.run(add_questions, interview_id, batch)
+                await db.commit()
+            generation.questions.extend(saved)
+            generation.notify()
+
+    async def _run(self, interview_id: int, job_description: str, job_title: str, generation: _Generation):
+        writer: Optional[asyncio.Task] = None
+
+        async def on_questions(questions: List[Dict[str, Any]]):
+            nonlocal writer
+            generation.pending.extend(questions)
+            if writer is None or writer.done():
+                writer = asyncio.create_task(self._write(interview_id, generation))
+
+        try:
+            await get_ai_service().stream_interview_questions(job_description, job_title, on_questions)
+        except Exception as e:
+            print(f"Error generating questions for interview {interview_id}: {e}")
+        try:
+            if writer is not None:
+                await writer
+        except Exception as e:
+            print(f"Error saving questions for interview {interview_id}: {e}")
+
+        final_status = "ready" if generation.questions else "failed"
+        try:
+            async with open_session() as db:
+                await db.run(set_question_status, interview_id, final_status)
+                await db.commit()
+        except Exception as e:
+            print(f"Error finishing question generation for interview {interview_id}: {e}")
+        finally:
+            generation.status = final_status
+            del self._generations[interview_id]
+            generation.notify()
+
+        if settings.tts_enabled and generation.questions:
+            await tts_service.synthesize_questions([q["question_text"] for q in generation.questions])
+
+    async def drain(self, timeout: float):
+        """Give in-flight generations up to `timeout` seconds to finish, e.g. at shutdown"""
+        if self._tasks:
+            await asyncio.wait(set(self._tasks), timeout=timeout)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {"in_progress": len(self._generations)}
+
+
+question_generations = QuestionGenerations()
@@ -0,0 +1,27 @@
+from typing import Optional
+import redis.asyncio as redis
+from .config import settings
+
+_client: Optional[redis.Redis] = None
+
+
+def get_redis() -> Optional[redis.Redis]:
+    """Return the shared async Redis client, or None when Redis is not configured"""
+    global _client
+    if not settings.redis_url:
+        return None
+    if _client is None:
+        _client = redis.Redis.from_url(
+            settings.redis_url,
+            socket_connect_timeout=settings.redis_timeout,
+            socket_timeout=settings.redis_timeout
+        )
+    return _client
+
+
+async def close_redis():
+    """Close the shared Redis connection pool"""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
@@ -0,0 +1,138 @@
+import re
+from pathlib import Path
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import Response as HTTPResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from ..config import settings
+from ..crud import get_question
+from ..database import SessionRunner, get_session_runner
+from ..feedback_reports import load_report
+from ..tts_service import tts_service
+
+router = APIRouter(prefix="/api/interviews", tags=["audio"])
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _read_range(path: Path, start: int, length: int) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.read(length)
+
+
+async def _ranged_file_response(path: Path, range_header: Optional[str], media_type: str) -> HTTPResponse:
+    """Serve a file, honouring a single-range Range header"""
+    size = path.stat().st_size
+    headers = {"Accept-Ranges": "bytes", "Cache-Control": "public, max-age=86400"}
+    
+    match = RANGE_PATTERN.match(range_header.strip()) if range_header else None
+    if not match or match.groups() == ("", ""):
+        # No (or unsupported multi-part) range: send the whole file
+        data = await run_in_threadpool(path.read_bytes)
+        return HTTPResponse(content=data, media_type=media_type, headers=headers)
+    
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # Suffix range: the final N bytes
+        start = max(size - int(last), 0)
+        end = size - 1
+    
+    if start >= size or start > end:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    
+    data = await run_in_threadpool(_read_range, path, start, end - start + 1)
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return HTTPResponse(
+        content=data,
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=media_type,
+        headers=headers
+    )
+
+
+def _audio_stream_response(text: str) -> StreamingResponse:
+    if not settings.tts_enabled:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Audio not available"
+        )
+    return StreamingResponse(
+        tts_service.stream(text),
+        media_type="audio/mpeg",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/{interview_id}/questions/{question_id}/audio")
+async def get_question_audio(
+    interview_id: int,
+    question_id: int,
+    request: Request,
+    db: SessionRunner = Depends(get_session_runner)
+):
+    """Get the spoken audio for a question"""
+    question = await db.run(get_question, interview_id, question_id)
+    if not question:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Question not found"
+        )
+    
+    # Usually pre-synthesized when the interview was created
+    path = await tts_service.cache.get_path(tts_service.cache_key(question.question_text))
+    if path is None:
+        if not settings.tts_enabled:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Audio not available"
+            )
+        try:
+            path = await tts_service.synthesize(question.question_text)
+        except Exception as e:
+            print(f"Error synthesizing audio: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail="Error synthesizing audio"
+            )
+    
+    return await _ranged_file_response(path, request.headers.get("range"), "audio/mpeg")
+
+
+
+@router.get("/{interview_id}/questions/{question_id}/audio/stream")
+async def stream_question_audio(
+    interview_id: int,
+    question_id: int,
+    db: SessionRunner = Depends(get_session_runner)
+):
+    """Stream the spoken audio for a question as it is synthesized"""
+    question = await db.run(get_question, interview_id, question_id)
+    if not question:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Question not found"
+        )
+    
+    return _audio_stream_response(question.question_text)
+
+
+@router.get("/{interview_id}/feedback/audio/stream")
+async def stream_feedback_audio(interview_id: int, db: SessionRunner = Depends(get_session_runner)):
+    """Stream the spoken summary of an interview's generated feedback"""
+    report = await db.run(load_report, interview_id, None)
+    if not report:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Feedback has not been generated yet"
+        )
+    
+    return _audio_stream_response(report["summary"])
\ No newline at end of file
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from ..batch_jobs import batch_job_store, batch_jobs
+from ..config import settings
+from ..dependencies import get_current_user_id
+from ..schemas import BatchJobStatus, InterviewBatchCreate
+
+router = APIRouter(prefix="/api/interviews", tags=["interviews"])
+
+
+@router.post("/batch", response_model=BatchJobStatus, status_code=status.HTTP_202_ACCEPTED)
+async def create_interview_batch(
+    batch: InterviewBatchCreate,
+    user_id: int = Depends(get_current_user_id)
+):
+    """Create many interviews in the background
+    
+    Returns a job whose progress, and the interview created for each item,
+    can be read from /batch/{job_id}.
+    """
+    if not batch.interviews:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The batch has no interviews"
+        )
+    if len(batch.interviews) > settings.batch_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch can have at most {settings.batch_max_items} interviews"
+        )
+    
+    return await batch_jobs.submit(user_id, [item.model_dump() for item in batch.interviews])
+
+
+@router.get("/batch/{job_id}", response_model=BatchJobStatus)
+async def get_interview_batch(job_id: str, user_id: int = Depends(get_current_user_id)):
+    """Get the progress of a batch job"""
+    job = await batch_job_store.get(job_id)
+    if job is None or job["user_id"] != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Batch job not found"
+        )
+    return job
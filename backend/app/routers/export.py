@@ -0,0 +1,51 @@
+import secrets
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from ..config import settings
+from ..export import check_compression, export_cutoff, export_interviews
+
+router = APIRouter(prefix="/api/export", tags=["export"])
+
+MEDIA_TYPES = {"none": "application/x-ndjson", "gzip": "application/gzip", "zstd": "application/zstd"}
+EXTENSIONS = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+
+@router.get("/interviews")
+def export_interview_data(
+    compression: str = Query("none", pattern="^(none|gzip|zstd)$"),
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    after: Optional[datetime] = None,
+    x_export_key: Optional[str] = Header(None)
+):
+    """Stream every interview, with its questions and responses, as NDJSON, oldest first
+    
+    created_from/created_to select a creation date range; after exports only
+    interviews changed since a watermark, for incremental loads. The next
+    watermark is returned in the X-Export-Watermark header.
+    """
+    if not settings.export_api_key or not secrets.compare_digest(x_export_key or "", settings.export_api_key):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="A valid X-Export-Key header is required"
+        )
+    try:
+        check_compression(compression)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    # A sync generator: Starlette pulls each batch in the threadpool
+    until = export_cutoff()
+    return StreamingResponse(
+        export_interviews(compression, created_from, created_to, after, until if after is not None else None),
+        media_type=MEDIA_TYPES[compression],
+        headers={
+            "Content-Disposition": f'attachment; filename="interviews.ndjson{EXTENSIONS[compression]}"',
+            "X-Export-Watermark": until.isoformat()
+        }
+    )
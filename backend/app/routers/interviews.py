@@ -1,118 +1,229 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+from datetime import datetime, timedelta, timezone
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, status
+from fastapi import Response as HTTPResponse
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
-from ..database import get_db
-from ..models import Interview, Question, Response, User
-from ..schemas import InterviewCreate, Interview as InterviewSchema, InterviewStart, InterviewResponse, InterviewFeedback
-from ..ai_service import AIService
+from typing import List, Optional
+from ..config import settings
+from ..database import SessionRunner, get_session_runner
+from ..schemas import (
+    InterviewCreate, Interview as InterviewSchema, InterviewStart, InterviewResponse, InterviewFeedback,
+    InterviewEvaluations, ResponseEvaluation
+)
+from ..ai_service import get_ai_service
+from ..auth import create_session_token
+from ..crud import (
+    create_interview_with_questions, decode_history_cursor, get_interview, get_interview_history_page,
+    get_responses, get_responses_with_questions, save_response
+)
+from ..dependencies import get_current_user_id
+from ..evaluations import EvaluationsPending, queue_evaluation, requeue_evaluations, screen_response
+from ..idempotency import run_idempotent
+from ..question_generation import question_generations
+from ..session_state import (
+    InterviewSession, QuestionNotReady, load_interview_session, refresh_session_questions, session_store,
+    start_interview_session, wait_for_question
+)
+from ..tts_service import tts_service
+from ..interview_summary import build_summary
+from ..feedback_reports import generation_lock, load_report, responses_fingerprint, save_report
 
 router = APIRouter(prefix="/api/interviews", tags=["interviews"])
-ai_service = AIService()
 
 
 @router.post("/create", response_model=InterviewSchema)
-def create_interview(interview_data: InterviewCreate, db: Session = Depends(get_db)):
-    """Create a new interview from job description"""
+async def create_interview(
+    interview_data: InterviewCreate,
+    background_tasks: BackgroundTasks,
+    http_response: HTTPResponse,
+    db: SessionRunner = Depends(get_session_runner),
+    user_id: int = Depends(get_current_user_id),
+    idempotency_key: Optional[str] = Header(None)
+):
+    """Create a new interview from job description
+    
+    A retry sent with the same Idempotency-Key header gets the interview
+    created by the first request instead of creating another.
+    """
+    async def create():
+        if settings.question_streaming:
+            return await _create_interview_progressively(interview_data, db, user_id)
+        return await _create_interview(interview_data, background_tasks, db, user_id)
+    
+    interview, replayed = await run_idempotent(
+        f"create:{user_id}", idempotency_key, interview_data.model_dump(), create
+    )
+    if replayed:
+        http_response.headers["Idempotent-Replayed"] = "true"
+    return interview
+
+
+async def _create_interview(
+    interview_data: InterviewCreate,
+    background_tasks: BackgroundTasks,
+    db: SessionRunner,
+    user_id: int
+):
     try:
-        # For now, create a mock user (in production, you'd get this from auth)
-        user = db.query(User).first()
-        if not user:
-            user = User(email="test@example.com", name="Test User")
-            db.add(user)
-            db.commit()
-            db.refresh(user)
-        
-        # Create interview
-        interview = Interview(
-            user_id=user.id,
-            job_title=interview_data.job_title,
-            job_description=interview_data.job_description,
-            company=interview_data.company
-        )
-        db.add(interview)
-        db.commit()
-        db.refresh(interview)
-        
-        # Generate questions using AI
-        questions_data = ai_service.generate_interview_questions(
+        # Generate questions using AI before opening a transaction, so no
+        # database connection is held while waiting on the LLM
+        questions_data = await get_ai_service().generate_interview_questions(
             interview_data.job_description,
             interview_data.job_title
         )
         
-        # Save questions to database
-        for q_data in questions_data:
-            question = Question(
-                interview_id=interview.id,
-                question_text=q_data["question_text"],
-                question_type=q_data["question_type"],
-                order_index=q_data["order_index"]
-            )
-            db.add(question)
+        # Save the interview and its questions in one transaction
+        interview = await db.run(create_interview_with_questions, user_id, interview_data.model_dump(), questions_data)
+        await db.commit()
         
-        db.commit()
+        if settings.tts_enabled:
+            # Have question audio ready by the time the interview starts
+            background_tasks.add_task(
+                tts_service.synthesize_questions,
+                [q["question_text"] for q in interview["questions"]]
+            )
         
         return interview
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error creating interview: {str(e)}"
+        )
+
+
+async def _create_interview_progressively(interview_data: InterviewCreate, db: SessionRunner, user_id: int):
+    """Save the interview first and return as soon as its first question exists
+    
+    The remaining questions are generated and saved in the background; the
+    interview's question_status stays "generating" until they are all in.
+    """
+    try:
+        interview = await db.run(
+            create_interview_with_questions, user_id, interview_data.model_dump(), [], question_status="generating"
+        )
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error creating interview: {str(e)}"
         )
+    
+    interview["questions"], interview["question_status"] = await question_generations.start(
+        interview["id"],
+        interview_data.job_description,
+        interview_data.job_title
+    )
+    return interview
+
+
+async def _wait_for_question(session: InterviewSession, db: SessionRunner, after: Optional[dict] = None) -> Optional[dict]:
+    try:
+        return await wait_for_question(session, db, after)
+    except QuestionNotReady:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="The next question is still being generated, please retry"
+        )
+
+
+async def _load_session(interview_id: int, db: SessionRunner) -> InterviewSession:
+    """Get the cached session state, rebuilding it from the database on a miss"""
+    session = await session_store.get(interview_id)
+    if session is None:
+        session = await db.run(load_interview_session, interview_id)
+        if not session:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Interview not found"
+            )
+        await session_store.put(session)
+    return session
 
 
 @router.post("/{interview_id}/start")
-def start_interview(interview_id: int, db: Session = Depends(get_db)):
-    """Start an interview session"""
-    interview = db.query(Interview).filter(Interview.id == interview_id).first()
-    if not interview:
+async def start_interview(
+    interview_id: int,
+    db: SessionRunner = Depends(get_session_runner),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Start an interview session
+    
+    The returned session_token opens the WebSocket channel at /{interview_id}/session.
+    """
+    session = await db.run(start_interview_session, interview_id)
+    if not session:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Interview not found"
         )
     
-    interview.status = "in_progress"
-    db.commit()
+    # Cache the ordered questions so each response needs no further lookups
+    await session_store.put(session)
     
-    # Get first question
-    first_question = db.query(Question).filter(
-        Question.interview_id == interview_id
-    ).order_by(Question.order_index).first()
+    # Get first question, waiting for it if generation is still under way
+    first_question = await _wait_for_question(session, db)
     
     return {
         "interview_id": interview_id,
         "status": "started",
-        "current_question": first_question.question_text if first_question else None,
-        "question_id": first_question.id if first_question else None
+        "current_question": first_question["question_text"] if first_question else None,
+        "question_id": first_question["id"] if first_question else None,
+        "session_token": create_session_token(user_id, interview_id)
     }
 
 
 @router.post("/{interview_id}/respond")
-def submit_response(
+async def submit_response(
     interview_id: int,
     response_data: InterviewResponse,
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    http_response: HTTPResponse,
+    db: SessionRunner = Depends(get_session_runner),
+    idempotency_key: Optional[str] = Header(None)
 ):
-    """Submit a response to a question"""
+    """Submit a response to a question
+    
+    A retry sent with the same Idempotency-Key header gets the result of the
+    first submission, even after the interview has moved on.
+    """
+    result, replayed = await run_idempotent(
+        f"respond:{interview_id}",
+        idempotency_key,
+        response_data.model_dump(),
+        lambda: _submit_response(interview_id, response_data, background_tasks, db)
+    )
+    if replayed:
+        http_response.headers["Idempotent-Replayed"] = "true"
+    return result
+
+
+async def _submit_response(
+    interview_id: int,
+    response_data: InterviewResponse,
+    background_tasks: BackgroundTasks,
+    db: SessionRunner
+) -> dict:
     # Verify interview exists and is in progress
-    interview = db.query(Interview).filter(Interview.id == interview_id).first()
-    if not interview:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Interview not found"
-        )
+    session = await _load_session(interview_id, db)
     
-    if interview.status != "in_progress":
+    if session.status != "in_progress":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Interview is not in progress"
         )
     
     # Get the question
-    question = db.query(Question).filter(
-        Question.id == response_data.question_id,
-        Question.interview_id == interview_id
-    ).first()
+    question = session.get_question(response_data.question_id)
+    if not question and session.question_status == "generating":
+        # Served after this session was cached, e.g. by another worker
+        await db.run(refresh_session_questions, session)
+        await db.rollback()
+        await session_store.put(session)
+        question = session.get_question(response_data.question_id)
     
     if not question:
         raise HTTPException(
@@ -120,50 +231,96 @@ def submit_response(
             detail="Question not found"
         )
     
-    # Evaluate response using AI
-    evaluation = ai_service.evaluate_response(
-        question.question_text,
-        response_data.response_text,
-        question.question_type
-    )
+    provisional_score = None
+    if settings.evaluation_mode == "inline":
+        # Evaluate response using AI
+        evaluation = await get_ai_service().evaluate_response(
+            question["question_text"],
+            response_data.response_text,
+            question["question_type"],
+            job_description=session.job_description
+        )
+        evaluation_status = "completed"
+    else:
+        evaluation, evaluation_status, provisional_score = await screen_response(
+            question,
+            response_data.response_text,
+            session.job_description
+        )
     
-    # Save response
-    response = Response(
-        interview_id=interview_id,
-        question_id=response_data.question_id,
-        response_text=response_data.response_text,
-        ai_feedback=evaluation["feedback"],
-        score=evaluation["score"]
-    )
-    db.add(response)
-    db.commit()
+    # Get next question, waiting if the candidate has caught up with generation
+    next_question = await _wait_for_question(session, db, question)
     
-    # Get next question
-    next_question = db.query(Question).filter(
-        Question.interview_id == interview_id,
-        Question.order_index > question.order_index
-    ).order_by(Question.order_index).first()
+    # Save response; on the last answer the status change shares its commit
+    response_id = await db.run(
+        save_response,
+        interview_id,
+        question,
+        response_data.response_text,
+        evaluation,
+        evaluation_status,
+        complete_interview=not next_question
+    )
+    if response_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Question already answered"
+        )
     
-    # Check if interview is complete
     if not next_question:
-        interview.status = "completed"
-        db.commit()
+        session.status = "completed"
+        await session_store.put(session)
+    
+    if evaluation_status == "pending":
+        queue_evaluation(response_id, background_tasks)
     
     return {
-        "response_id": response.id,
+        "response_id": response_id,
         "feedback": evaluation["feedback"],
         "score": evaluation["score"],
         "suggestions": evaluation["suggestions"],
-        "next_question": next_question.question_text if next_question else None,
-        "next_question_id": next_question.id if next_question else None,
+        "evaluation_status": evaluation_status,
+        "provisional_score": provisional_score,
+        "next_question": next_question["question_text"] if next_question else None,
+        "next_question_id": next_question["id"] if next_question else None,
         "interview_complete": not next_question
     }
 
 
-@router.get("/{interview_id}/feedback", response_model=InterviewFeedback)
-def get_interview_feedback(interview_id: int, db: Session = Depends(get_db)):
-    """Get comprehensive feedback for completed interview"""
-    interview = db.query(Interview).filter(Interview.id == interview_id).first()
+@router.get("/{interview_id}/evaluations", response_model=InterviewEvaluations)
+async def get_response_evaluations(interview_id: int, db: SessionRunner = Depends(get_session_runner)):
+    """Poll the evaluation status of an interview's responses"""
+    interview = await db.run(get_interview, interview_id)
+    if not interview:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Interview not found"
+        )
+    
+    responses = await db.run(get_responses, interview_id)
+    
+    evaluations = [
+        ResponseEvaluation(
+            response_id=response.id,
+            question_id=response.question_id,
+            evaluation_status=response.evaluation_status,
+            score=response.score,
+            feedback=response.ai_feedback,
+            suggestions=response.suggestions or []
+        )
+        for response in responses
+    ]
+    
+    return InterviewEvaluations(
+        interview_id=interview_id,
+        pending=sum(1 for e in evaluations if e.evaluation_status == "pending"),
+        evaluations=evaluations
+    )
+
+
+def _load_feedback_data(db: Session, interview_id: int) -> dict:
+    """Collect the questions and responses of a completed interview for AI feedback"""
+    interview = get_interview(db, interview_id)
     if not interview:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -176,42 +333,144 @@ def get_interview_feedback(interview_id: int, db: Session = Depends(get_db)):
             detail="Interview is not completed"
         )
     
-    # Get all responses with questions
-    responses = db.query(Response).filter(Response.interview_id == interview_id).all()
-    questions = db.query(Question).filter(Question.interview_id == interview_id).all()
+    # Get all responses with their questions in one query
+    rows = get_responses_with_questions(db, interview_id)
+    pending = [response for response, _ in rows if response.evaluation_status == "pending"]
+    if pending:
+        stale_before = datetime.now(timezone.utc) - timedelta(seconds=settings.evaluation_stale_after)
+        stale_ids = []
+        for response in pending:
+            created_at = response.created_at
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)  # SQLite returns naive UTC
+            if created_at < stale_before:
+                stale_ids.append(response.id)
+        raise EvaluationsPending(stale_ids)
+    
+    # The prompt is built from the running summary; rebuild it if it missed an evaluation
+    summary = interview.running_summary
+    evaluated = sum(1 for response, _ in rows if response.evaluation_status == "completed")
+    if not summary or summary["answered"] != evaluated:
+        summary = build_summary(rows)
     
     # Prepare data for AI feedback
     interview_data = {
         "job_title": interview.job_title,
-        "responses": []
-    }
-    
-    for response in responses:
-        question = next((q for q in questions if q.id == response.question_id), None)
-        if question:
-            interview_data["responses"].append({
+        "summary": summary,
+        "responses": [
+            {
                 "question": question.question_text,
                 "response": response.response_text,
                 "score": response.score,
                 "feedback": response.ai_feedback
-            })
-    
-    # Generate overall feedback
-    overall_feedback = ai_service.generate_interview_feedback(interview_data)
+            }
+            for response, question in rows
+        ]
+    }
     
+    return interview_data
+
+
+async def _feedback_data(db: SessionRunner, interview_id: int) -> dict:
+    try:
+        return await db.run(_load_feedback_data, interview_id)
+    except EvaluationsPending as e:
+        # Lost to a restart or a dropped job: without this the interview would never get feedback
+        requeue_evaluations(e.stale_ids)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Response evaluations are still pending"
+        )
+
+
+def _feedback_result(interview_id: int, interview_data: dict, overall_feedback: dict) -> InterviewFeedback:
     return InterviewFeedback(
         interview_id=interview_id,
         overall_score=overall_feedback["overall_score"],
         feedback_summary=overall_feedback["summary"],
+        strengths=overall_feedback["strengths"],
+        improvements=overall_feedback["improvements"],
+        recommendations=overall_feedback["recommendations"],
         detailed_feedback=interview_data["responses"]
     )
 
 
+@router.get("/{interview_id}/feedback", response_model=InterviewFeedback)
+async def get_interview_feedback(interview_id: int, db: SessionRunner = Depends(get_session_runner)):
+    """Get comprehensive feedback for completed interview"""
+    interview_data = await _feedback_data(db, interview_id)
+    fingerprint = responses_fingerprint(interview_data)
+    
+    # Serve the stored report unless the responses changed since it was generated
+    overall_feedback = await db.run(load_report, interview_id, fingerprint)
+    if overall_feedback is None:
+        async with generation_lock(interview_id):
+            # A concurrent request may have generated it while we waited
+            overall_feedback = await db.run(load_report, interview_id, fingerprint)
+            if overall_feedback is None:
+                # Generate overall feedback
+                overall_feedback = await get_ai_service().generate_interview_feedback(interview_data)
+                # Placeholder or fallback feedback is served but not stored, so real feedback replaces it later
+                if settings.openai_enabled and not get_ai_service().is_fallback_feedback(overall_feedback):
+                    await db.run(save_report, interview_id, fingerprint, overall_feedback)
+    
+    return _feedback_result(interview_id, interview_data, overall_feedback)
+
+
+@router.get("/{interview_id}/feedback/stream")
+async def stream_interview_feedback(interview_id: int, db: SessionRunner = Depends(get_session_runner)):
+    """Stream comprehensive feedback for completed interview as Server-Sent Events"""
+    interview_data = await _feedback_data(db, interview_id)
+    fingerprint = responses_fingerprint(interview_data)
+    
+    def sse(event: str, data) -> str:
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    
+    async def event_stream():
+        async with generation_lock(interview_id):
+            stored = await db.run(load_report, interview_id, fingerprint)
+            if stored is not None:
+                yield sse("result", _feedback_result(interview_id, interview_data, stored).model_dump())
+                return
+            
+            async for event in get_ai_service().stream_interview_feedback(interview_data):
+                data = event["data"]
+                if event["event"] == "result":
+                    if settings.openai_enabled and not get_ai_service().is_fallback_feedback(data):
+                        await db.run(save_report, interview_id, fingerprint, data)
+                    data = _feedback_result(interview_id, interview_data, data).model_dump()
+                yield sse(event["event"], data)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/history")
-def get_interview_history(db: Session = Depends(get_db)):
-    """Get user's interview history"""
-    # For now, get all interviews (in production, filter by user)
-    interviews = db.query(Interview).order_by(Interview.created_at.desc()).all()
+async def get_interview_history(
+    http_response: HTTPResponse,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: SessionRunner = Depends(get_session_runner),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Get user's interview history, one page at a time
+    
+    The cursor for the next page is returned in the X-Next-Cursor header.
+    """
+    try:
+        after = decode_history_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    
+    interviews, next_cursor = await db.run(get_interview_history_page, user_id, limit, after)
+    if next_cursor:
+        http_response.headers["X-Next-Cursor"] = next_cursor
     
     return [
         {
@@ -223,4 +482,4 @@ def get_interview_history(db: Session = Depends(get_db)):
             "completed_at": interview.completed_at
         }
         for interview in interviews
-    ] 
\ No newline at end of file
+    ]
\ No newline at end of file
@@ -0,0 +1,280 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional, Set
+from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketDisconnect, status
+from ..auth import verify_session_token
+from ..config import settings
+from ..crud import get_response_evaluations, save_response
+from ..database import SessionRunner, get_session_runner, open_session
+from ..evaluations import queue_evaluation, screen_response
+from ..schemas import ResponseEvaluation
+from ..session_state import InterviewSession, QuestionNotReady, load_interview_session, session_store, wait_for_question
+
+router = APIRouter(prefix="/api/interviews", tags=["interviews"])
+
+
+def _question_message(question: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "type": "question",
+        "question_id": question["id"],
+        "question_text": question["question_text"],
+        "question_type": question["question_type"],
+        "order_index": question["order_index"]
+    }
+
+
+def _stored_evaluation_message(row: Dict[str, Any]) -> Dict[str, Any]:
+    return _evaluation_message(row["id"], row["question_id"], row["evaluation_status"] or "completed", row)
+
+
+def _evaluation_message(response_id: int, question_id: int, evaluation_status: str, evaluation: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "type": "evaluation",
+        **ResponseEvaluation(
+            response_id=response_id,
+            question_id=question_id,
+            evaluation_status=evaluation_status,
+            score=evaluation.get("score"),
+            feedback=evaluation.get("feedback"),
+            suggestions=evaluation.get("suggestions") or []
+        ).model_dump()
+    }
+
+
+class InterviewChannel:
+    """One candidate's WebSocket session for an interview
+
+    The ordered questions are loaded once and held for the life of the
+    connection. Each answer is saved and acknowledged with the next question
+    straight away, while its evaluation runs alongside and is pushed when it
+    is ready.
+    """
+
+    def __init__(self, websocket: WebSocket, session: InterviewSession, db: SessionRunner):
+        self.websocket = websocket
+        self.session = session
+        self.db = db
+        self.current: Optional[Dict[str, Any]] = None  # the question awaiting an answer
+        self._send_lock = asyncio.Lock()
+        self._tasks: Set[asyncio.Task] = set()
+        self._last_seen = time.monotonic()
+
+    async def send(self, message: Dict[str, Any]):
+        async with self._send_lock:
+            await self.websocket.send_json(message)
+
+    async def _push(self, message: Dict[str, Any]):
+        # Pushes from background work may outlive the connection
+        try:
+            await self.send(message)
+        except Exception:
+            pass
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def run(self):
+        try:
+            await self._serve()
+        except WebSocketDisconnect:
+            # Evaluations under way still finish and are stored; the client picks them up on resume
+            pass
+        finally:
+            # Watchers would otherwise poll for a connection that is gone
+            for task in list(self._tasks):
+                task.cancel()
+
+    async def _serve(self):
+        await self.resume()
+        while True:
+            try:
+                message = await asyncio.wait_for(self.websocket.receive_json(), settings.ws_heartbeat_interval)
+            except asyncio.TimeoutError:
+                if time.monotonic() - self._last_seen >= settings.ws_idle_timeout:
+                    await self.websocket.close(code=status.WS_1001_GOING_AWAY)
+                    return
+                await self.send({"type": "ping"})
+                continue
+            except (ValueError, KeyError):
+                await self.send({"type": "error", "detail": "Messages must be JSON text"})
+                continue
+            self._last_seen = time.monotonic()
+            await self.handle(message)
+
+    async def handle(self, message: Any):
+        kind = message.get("type") if isinstance(message, dict) else None
+        if kind == "answer":
+            await self.answer(message)
+        elif kind == "ping":
+            await self.send({"type": "pong"})
+        elif kind != "pong":
+            await self.send({"type": "error", "detail": f"Unknown message type: {kind}"})
+
+    async def resume(self):
+        """Send the evaluations so far, then the question to answer next (or completion)"""
+        responses = await self.db.run(get_response_evaluations, self.session.interview_id)
+        await self.db.rollback()
+
+        answered = {r["question_id"] for r in responses}
+        pending = {r["id"]: r["question_id"] for r in responses if r["evaluation_status"] == "pending"}
+        await self.send({
+            "type": "session",
+            "interview_id": self.session.interview_id,
+            "status": self.session.status,
+            "answered": len(responses),
+            "evaluations": [_stored_evaluation_message(r) for r in responses]
+        })
+
+        if pending:
+            self._spawn(self._watch(pending))
+
+        self.current = next((q for q in self.session.questions if q["id"] not in answered), None)
+        if self.current is None and self.session.status != "completed":
+            last = max(
+                (q for q in self.session.questions if q["id"] in answered),
+                key=lambda q: q["order_index"],
+                default=None
+            )
+            try:
+                self.current = await wait_for_question(self.session, self.db, last)
+            except QuestionNotReady:
+                await self.send({"type": "error", "detail": "The next question is still being generated, please reconnect"})
+                return
+
+        if self.current is not None:
+            await self.send(_question_message(self.current))
+        else:
+            self._spawn(self._finish())
+
+    async def answer(self, message: Dict[str, Any]):
+        question = self.current
+        response_text = message.get("response_text")
+        if question is None or message.get("question_id") != question["id"]:
+            await self.send({"type": "error", "detail": "Only the current question can be answered"})
+            return
+        if not isinstance(response_text, str) or not response_text.strip():
+            await self.send({"type": "error", "detail": "response_text is required"})
+            return
+
+        evaluation, evaluation_status, provisional_score = await screen_response(
+            question,
+            response_text,
+            self.session.job_description
+        )
+        try:
+            next_question = await wait_for_question(self.session, self.db, question)
+        except QuestionNotReady:
+            # Nothing was saved, so the client can send the same answer again
+            await self.send({"type": "error", "detail": "The next question is still being generated, please resend the answer"})
+            return
+
+        response_id = await self.db.run(
+            save_response,
+            self.session.interview_id,
+            question,
+            response_text,
+            evaluation,
+            evaluation_status,
+            complete_interview=not next_question
+        )
+        if response_id is None:
+            # Answered over another connection: resync the client with what was stored
+            await self.send({"type": "error", "detail": "Question already answered"})
+            await self.resume()
+            return
+        self.current = next_question
+
+        await self.send({
+            "type": "answer_saved",
+            "question_id": question["id"],
+            "response_id": response_id,
+            "evaluation_status": evaluation_status,
+            "provisional_score": provisional_score
+        })
+        if evaluation_status == "pending":
+            self._spawn(self._evaluate(response_id, question["id"]))
+        else:
+            await self.send(_evaluation_message(response_id, question["id"], evaluation_status, evaluation))
+
+        if next_question:
+            await self.send(_question_message(next_question))
+        else:
+            self.session.status = "completed"
+            await session_store.put(self.session)
+            self._spawn(self._finish())
+
+    async def _evaluate(self, response_id: int, question_id: int):
+        scoring = queue_evaluation(response_id)
+        if scoring is None:
+            # Scored by a Celery worker
+            await self._watch({response_id: question_id})
+            return
+        try:
+            # Shielded: closing the connection stops the push, not the scoring
+            evaluation = await asyncio.shield(scoring)
+        except Exception:
+            await self._push(_evaluation_message(response_id, question_id, "failed", {}))
+            return
+        if evaluation is not None:
+            await self._push(_evaluation_message(response_id, question_id, "completed", evaluation))
+
+    async def _watch(self, pending: Dict[int, int]):
+        """Push evaluations scored outside this connection, by a worker or an earlier connection
+
+        `pending` maps response ids to their question ids. Evaluations still
+        pending after ws_evaluation_timeout are reported as failed, so the
+        client is not left waiting on a lost job; the stored row is untouched.
+        """
+        remaining = dict(pending)
+        deadline = time.monotonic() + settings.ws_evaluation_timeout
+        while remaining:
+            if time.monotonic() >= deadline:
+                for response_id, question_id in remaining.items():
+                    await self._push(_evaluation_message(response_id, question_id, "failed", {
+                        "feedback": "The evaluation is taking longer than expected; check /evaluations later"
+                    }))
+                return
+            await asyncio.sleep(settings.ws_evaluation_poll_interval)
+            async with open_session() as db:
+                responses = await db.run(get_response_evaluations, self.session.interview_id)
+            for r in responses:
+                if r["id"] in remaining and r["evaluation_status"] != "pending":
+                    del remaining[r["id"]]
+                    await self._push(_stored_evaluation_message(r))
+
+    async def _finish(self):
+        # Sent after the last evaluation, so the client can ask for feedback straight away
+        others = [task for task in self._tasks if task is not asyncio.current_task()]
+        await asyncio.gather(*others, return_exceptions=True)
+        await self._push({"type": "complete", "interview_id": self.session.interview_id})
+
+
+@router.websocket("/{interview_id}/session")
+async def interview_session_channel(
+    websocket: WebSocket,
+    interview_id: int,
+    token: str = Query(...),
+    db: SessionRunner = Depends(get_session_runner)
+):
+    """Run an interview over one WebSocket, authenticated with the token issued by /start
+
+    Client messages: {"type": "answer", "question_id", "response_text"} and
+    {"type": "ping"}. The server sends "session" on connect (with every
+    evaluation so far), "question", "answer_saved", "evaluation", "complete",
+    "ping"/"pong" and "error". Reconnecting resumes from the first unanswered
+    question.
+    """
+    if verify_session_token(token, interview_id) is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Invalid session token")
+        return
+
+    session = await db.run(load_interview_session, interview_id)
+    await db.rollback()
+    if session is None or session.status == "created":
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Interview not started")
+        return
+
+    await websocket.accept()
+    await InterviewChannel(websocket, session, db).run()
@@ -52,7 +52,9 @@ class Response(ResponseBase):
     interview_id: int
     question_id: int
     ai_feedback: Optional[str] = None
+    suggestions: Optional[List[str]] = None
     score: Optional[float] = None
+    evaluation_status: Optional[str] = None
     created_at: datetime
     
     class Config:
@@ -73,6 +75,7 @@ class Interview(InterviewBase):
     id: int
     user_id: int
     status: str
+    question_status: str = "ready"
     created_at: datetime
     completed_at: Optional[datetime] = None
     questions: List[Question] = []
@@ -82,6 +85,27 @@ class Interview(InterviewBase):
         from_attributes = True
 
 
+class InterviewBatchCreate(BaseModel):
+    interviews: List[InterviewCreate]
+
+
+class BatchItemStatus(BaseModel):
+    index: int
+    status: str  # pending, completed, failed
+    interview_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BatchJobStatus(BaseModel):
+    job_id: str
+    status: str  # running, completed
+    total: int
+    completed: int
+    failed: int
+    postings: int  # distinct job postings, each generated once
+    items: List[BatchItemStatus]
+
+
 class InterviewStart(BaseModel):
     interview_id: int
 
@@ -91,8 +115,26 @@ class InterviewResponse(BaseModel):
     question_id: int
 
 
+class ResponseEvaluation(BaseModel):
+    response_id: int
+    question_id: int
+    evaluation_status: str
+    score: Optional[float] = None
+    feedback: Optional[str] = None
+    suggestions: List[str] = []
+
+
+class InterviewEvaluations(BaseModel):
+    interview_id: int
+    pending: int
+    evaluations: List[ResponseEvaluation]
+
+
 class InterviewFeedback(BaseModel):
     interview_id: int
     overall_score: float
     feedback_summary: str
+    strengths: List[str] = []
+    improvements: List[str] = []
+    recommendations: List[str] = []
     detailed_feedback: List[dict] 
\ No newline at end of file
@@ -0,0 +1,171 @@
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+import redis.asyncio as redis
+from sqlalchemy.orm import Session
+from .config import settings
+from .crud import get_interview
+from .models import Interview, Question
+from .question_generation import question_generations
+from .redis_client import get_redis
+
+
+@dataclass
+class InterviewSession:
+    """Ordered questions and progress of an interview, cached for the start/respond hot path"""
+    interview_id: int
+    status: str
+    questions: List[Dict[str, Any]] = field(default_factory=list)
+    job_description: str = ""
+    question_status: str = "ready"  # "generating" while questions are still being added
+    
+    @classmethod
+    def from_interview(cls, interview: Interview) -> "InterviewSession":
+        return cls(
+            interview_id=interview.id,
+            status=interview.status,
+            questions=[
+                {
+                    "id": q.id,
+                    "question_text": q.question_text,
+                    "question_type": q.question_type,
+                    "order_index": q.order_index
+                }
+                for q in sorted(interview.questions, key=lambda q: q.order_index)
+            ],
+            job_description=interview.job_description or "",
+            question_status=interview.question_status or "ready"
+        )
+    
+    def first_question(self) -> Optional[Dict[str, Any]]:
+        return self.questions[0] if self.questions else None
+    
+    def get_question(self, question_id: int) -> Optional[Dict[str, Any]]:
+        return next((q for q in self.questions if q["id"] == question_id), None)
+    
+    def next_question(self, question: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return next((q for q in self.questions if q["order_index"] > question["order_index"]), None)
+
+
+def load_interview_session(db: Session, interview_id: int) -> Optional[InterviewSession]:
+    """Build an interview's session state from the database"""
+    interview = get_interview(db, interview_id, with_details=True)
+    return InterviewSession.from_interview(interview) if interview else None
+
+
+def refresh_session_questions(db: Session, session: InterviewSession):
+    """Add questions saved since the session was built and pick up the generation status"""
+    # Status first: once it reads "ready", every question was committed before it
+    session.question_status = db.query(Interview.question_status).filter(
+        Interview.id == session.interview_id
+    ).scalar() or "ready"
+    last_order_index = session.questions[-1]["order_index"] if session.questions else 0
+    rows = (
+        db.query(Question.id, Question.question_text, Question.question_type, Question.order_index)
+        .filter(Question.interview_id == session.interview_id, Question.order_index > last_order_index)
+        .order_by(Question.order_index)
+        .all()
+    )
+    session.questions.extend(row._asdict() for row in rows)
+
+
+class QuestionNotReady(Exception):
+    """The next question is still being generated after waiting for it"""
+
+
+async def wait_for_question(session: InterviewSession, db, after: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """The question following `after` (the first one without it), waiting while it is still being generated
+    
+    `db` is a SessionRunner. Returns None only once generation has finished
+    without such a question; raises QuestionNotReady after question_wait_timeout.
+    """
+    deadline = time.monotonic() + settings.question_wait_timeout
+    refreshed = False
+    while True:
+        question = session.next_question(after) if after else session.first_question()
+        if question is not None or session.question_status != "generating":
+            break
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise QuestionNotReady()
+        await question_generations.wait(session.interview_id, min(remaining, settings.question_poll_interval))
+        await db.run(refresh_session_questions, session)
+        # End the read transaction so no pooled connection is held between polls
+        await db.rollback()
+        refreshed = True
+    
+    if refreshed:
+        await session_store.put(session)
+    return question
+
+
+def start_interview_session(db: Session, interview_id: int) -> Optional[InterviewSession]:
+    """Mark an interview in progress and return its session state"""
+    interview = get_interview(db, interview_id, with_details=True)
+    if not interview:
+        return None
+    interview.status = "in_progress"
+    session = InterviewSession.from_interview(interview)
+    db.commit()
+    return session
+
+
+class SessionStore:
+    """Interview sessions with TTL, kept in Redis when configured and in-process otherwise"""
+    
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._local: Dict[int, tuple] = {}
+    
+    @staticmethod
+    def _key(interview_id: int) -> str:
+        return f"session:{interview_id}"
+    
+    async def get(self, interview_id: int) -> Optional[InterviewSession]:
+        client = get_redis()
+        if client is not None:
+            try:
+                raw = await client.get(self._key(interview_id))
+                return InterviewSession(**json.loads(raw)) if raw is not None else None
+            except (redis.RedisError, OSError) as e:
+                print(f"Redis session read failed: {e}")
+                return None
+        
+        entry = self._local.get(interview_id)
+        if entry is None:
+            return None
+        expires_at, session = entry
+        if expires_at < time.monotonic():
+            del self._local[interview_id]
+            return None
+        return session
+    
+    async def put(self, session: InterviewSession):
+        client = get_redis()
+        if client is not None:
+            try:
+                await client.set(self._key(session.interview_id), json.dumps(asdict(session)), ex=self.ttl_seconds)
+            except (redis.RedisError, OSError) as e:
+                print(f"Redis session write failed: {e}")
+            return
+        
+        self._evict_expired()
+        self._local[session.interview_id] = (time.monotonic() + self.ttl_seconds, session)
+    
+    async def delete(self, interview_id: int):
+        client = get_redis()
+        if client is not None:
+            try:
+                await client.delete(self._key(interview_id))
+            except (redis.RedisError, OSError) as e:
+                print(f"Redis session delete failed: {e}")
+        self._local.pop(interview_id, None)
+    
+    def _evict_expired(self):
+        now = time.monotonic()
+        for interview_id in [k for k, (expires_at, _) in self._local.items() if expires_at < now]:
+            del self._local[interview_id]
+
+
+session_store = SessionStore(ttl_seconds=settings.session_ttl)
@@ -0,0 +1,161 @@
+import asyncio
+import json
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict
+from redis.exceptions import RedisError
+from .config import settings
+from .redis_client import get_redis
+
+# Delete the lock only if this worker still holds it
+RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+@asynccontextmanager
+async def redis_lock(name: str, ttl: int, wait_timeout: float, poll_interval: float) -> AsyncIterator[bool]:
+    """Hold a Redis lock shared by all workers, yielding whether it was acquired
+
+    Gives up waiting after wait_timeout, and without Redis, or on a Redis
+    error, runs unlocked: callers must tolerate the occasional duplicate.
+    """
+    client = get_redis()
+    if client is None:
+        yield False
+        return
+
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + wait_timeout
+    acquired = False
+    try:
+        while not await client.set(name, token, nx=True, ex=ttl):
+            if time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(poll_interval)
+        else:
+            acquired = True
+    except RedisError as e:
+        print(f"Redis lock error: {e}")
+
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            try:
+                await client.eval(RELEASE_SCRIPT, 1, name, token)
+            except RedisError as e:
+                print(f"Redis lock error: {e}")
+
+
+class _Flight:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into a single execution
+
+    Within a process, callers share the leader's future. Across workers, the
+    leader holds a Redis lock and publishes its result under a short-lived key
+    that the other workers poll for. Results must be JSON-serializable.
+    """
+
+    def __init__(self, namespace: str, lock_ttl: int, result_ttl: int, wait_timeout: float, poll_interval: float):
+        self.namespace = namespace
+        self.lock_ttl = lock_ttl
+        self.result_ttl = result_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self._calls: Dict[str, "_Flight"] = {}
+        self.stats: Dict[str, int] = {
+            "calls": 0,
+            "coalesced_local": 0,
+            "coalesced_remote": 0,
+            "redis_errors": 0
+        }
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn once for every concurrent caller using the same key
+
+        The call runs in a task of its own, so a caller that is cancelled (say,
+        its client disconnected) stops waiting without cancelling the call for
+        the others. The call is only cancelled once every caller has given up.
+        """
+        flight = self._calls.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(self._do_shared(key, fn)))
+            self._calls[key] = flight
+            flight.task.add_done_callback(lambda _: self._calls.pop(key, None))
+            # Mark failures as retrieved so an error without waiters is not logged twice
+            flight.task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        else:
+            self.stats["coalesced_local"] += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Nobody is left to use the result
+                flight.task.cancel()
+
+    async def _do_shared(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        client = get_redis()
+        if client is None:
+            return await self._call(fn)
+
+        lock_key = f"{self.namespace}:lock:{key}"
+        result_key = f"{self.namespace}:result:{key}"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.wait_timeout
+        try:
+            while True:
+                cached = await client.get(result_key)
+                if cached is not None:
+                    self.stats["coalesced_remote"] += 1
+                    return json.loads(cached)
+                if await client.set(lock_key, token, nx=True, ex=self.lock_ttl):
+                    break
+                if time.monotonic() >= deadline:
+                    # The leader is taking too long; stop waiting on it
+                    return await self._call(fn)
+                await asyncio.sleep(self.poll_interval)
+        except RedisError as e:
+            print(f"Single-flight Redis error: {e}")
+            self.stats["redis_errors"] += 1
+            return await self._call(fn)
+
+        try:
+            result = await self._call(fn)
+            try:
+                await client.set(result_key, json.dumps(result), ex=self.result_ttl)
+            except RedisError as e:
+                print(f"Single-flight Redis error: {e}")
+                self.stats["redis_errors"] += 1
+            return result
+        finally:
+            try:
+                await client.eval(RELEASE_SCRIPT, 1, lock_key, token)
+            except RedisError as e:
+                print(f"Single-flight Redis error: {e}")
+                self.stats["redis_errors"] += 1
+
+    async def _call(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.stats["calls"] += 1
+        return await fn()
+
+
+question_flight = SingleFlight(
+    "singleflight:questions",
+    lock_ttl=settings.singleflight_lock_ttl,
+    result_ttl=settings.singleflight_result_ttl,
+    wait_timeout=settings.singleflight_wait_timeout,
+    poll_interval=settings.singleflight_poll_interval
+)
@@ -0,0 +1,243 @@
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+import redis.asyncio as redis
+from fastapi.concurrency import run_in_threadpool
+from .config import settings
+from .redis_client import get_redis
+
+
+class AudioCache:
+    """Content-addressed audio files on disk, shared between workers through Redis"""
+    
+    def __init__(self, directory: str, redis_ttl: int, redis_max_bytes: int):
+        self.directory = Path(directory)
+        self.redis_ttl = redis_ttl
+        self.redis_max_bytes = redis_max_bytes
+    
+    @staticmethod
+    def make_key(text: str, voice_id: str, model_id: str, output_format: str) -> str:
+        payload = "\x1f".join([" ".join(text.split()), voice_id, model_id, output_format])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def path_for(self, key: str) -> Path:
+        # Fan out into subdirectories so no single directory grows huge
+        return self.directory / key[:2] / f"{key}.mp3"
+    
+    @staticmethod
+    def _redis_key(key: str) -> str:
+        return f"audio:{key}"
+    
+    async def get_path(self, key: str) -> Optional[Path]:
+        """Return the cached file for a key, pulling it from Redis onto disk if needed"""
+        path = self.path_for(key)
+        if path.exists():
+            return path
+        
+        client = get_redis()
+        if client is not None:
+            try:
+                data = await client.get(self._redis_key(key))
+            except (redis.RedisError, OSError) as e:
+                print(f"Redis audio read failed: {e}")
+                data = None
+            if data is not None:
+                await run_in_threadpool(self._write_file, path, data)
+                return path
+        return None
+    
+    async def put(self, key: str, data: bytes) -> Path:
+        """Store synthesized audio on disk and, if small enough, in Redis"""
+        path = self.path_for(key)
+        await run_in_threadpool(self._write_file, path, data)
+        
+        client = get_redis()
+        if client is not None and len(data) <= self.redis_max_bytes:
+            try:
+                await client.set(self._redis_key(key), data, ex=self.redis_ttl)
+            except (redis.RedisError, OSError) as e:
+                print(f"Redis audio write failed: {e}")
+        return path
+    
+    @staticmethod
+    def _write_file(path: Path, data: bytes):
+        # Write to a temporary file and rename, so readers never see partial audio
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+
+class ElevenLabsProvider:
+    """Streams audio from the ElevenLabs text-to-speech API"""
+    
+    def __init__(self):
+        self._client = None
+    
+    def _get_client(self):
+        # Imported lazily: the SDK is only needed once audio is actually synthesized
+        if self._client is None:
+            from elevenlabs.client import ElevenLabs
+            self._client = ElevenLabs(api_key=settings.elevenlabs_api_key)
+        return self._client
+    
+    def stream(self, text: str) -> Iterator[bytes]:
+        """Yield audio chunks as the API returns them"""
+        return self._get_client().text_to_speech.convert(
+            text=text,
+            voice_id=settings.tts_voice_id,
+            model_id=settings.tts_model_id,
+            output_format=settings.tts_output_format,
+        )
+
+
+class FakeTTSProvider:
+    """Offline provider emitting deterministic synthetic audio at a fixed byte rate"""
+    
+    def __init__(self, bytes_per_second: int, chunk_size: int, bytes_per_char: int = 64):
+        self.bytes_per_second = bytes_per_second
+        self.chunk_size = chunk_size
+        self.bytes_per_char = bytes_per_char
+    
+    def stream(self, text: str) -> Iterator[bytes]:
+        pattern = hashlib.sha256(text.encode("utf-8")).digest()
+        total = max(len(text), 1) * self.bytes_per_char
+        data = b"ID3" + (pattern * (total // len(pattern) + 1))[:total]
+        for i in range(0, len(data), self.chunk_size):
+            chunk = data[i:i + self.chunk_size]
+            time.sleep(len(chunk) / self.bytes_per_second)
+            yield chunk
+
+
+# Marks the end of a provider stream in the bounded buffer
+_END_OF_STREAM = object()
+
+
+class TTSService:
+    """Text-to-speech for interview questions and feedback, backed by a provider and the audio cache"""
+    
+    def __init__(self, cache: AudioCache, provider):
+        self.cache = cache
+        self.provider = provider
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._semaphore = asyncio.Semaphore(settings.tts_concurrency)
+    
+    def cache_key(self, text: str) -> str:
+        return self.cache.make_key(text, settings.tts_voice_id, settings.tts_model_id, settings.tts_output_format)
+    
+    def _convert(self, text: str) -> bytes:
+        return b"".join(self.provider.stream(text))
+    
+    async def synthesize(self, text: str) -> Path:
+        """Return the audio file for text, synthesizing it once on a cache miss"""
+        key = self.cache_key(text)
+        path = await self.cache.get_path(key)
+        if path is not None:
+            return path
+        
+        # Concurrent requests for the same text share one synthesis. It runs in a task of its own, so a
+        # cancelled caller neither strands the others nor throws away audio that is cached for later.
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._synthesize(key, text))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            # Mark a failure retrieved when nobody is waiting on it anymore
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return await asyncio.shield(task)
+    
+    async def _synthesize(self, key: str, text: str) -> Path:
+        async with self._semaphore:
+            data = await run_in_threadpool(self._convert, text)
+        return await self.cache.put(key, data)
+    
+    async def stream(self, text: str) -> AsyncIterator[bytes]:
+        """Yield audio for text as soon as chunks are available
+        
+        Cached audio is read from disk. On a miss the provider runs in a worker
+        thread feeding a bounded buffer; when the client reads slowly the buffer
+        fills and the thread blocks, which in turn stops reading from the provider.
+        A completed stream is written to the cache so later requests hit disk.
+        """
+        key = self.cache_key(text)
+        path = await self.cache.get_path(key)
+        if path is not None:
+            async for chunk in _iter_file(path, settings.tts_stream_chunk_size):
+                yield chunk
+            return
+        
+        loop = asyncio.get_running_loop()
+        buffer: asyncio.Queue = asyncio.Queue(maxsize=settings.tts_stream_buffer_chunks)
+        stopped = threading.Event()
+        
+        def put(item):
+            asyncio.run_coroutine_threadsafe(buffer.put(item), loop).result()
+        
+        def produce():
+            try:
+                for chunk in self.provider.stream(text):
+                    if stopped.is_set():
+                        return
+                    put(chunk)
+                put(_END_OF_STREAM)
+            except Exception as e:
+                if not stopped.is_set():
+                    put(e)
+        
+        loop.run_in_executor(None, produce)
+        chunks = []
+        try:
+            while True:
+                item = await buffer.get()
+                if item is _END_OF_STREAM:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                chunks.append(item)
+                yield item
+            
+            await self.cache.put(key, b"".join(chunks))
+        finally:
+            stopped.set()
+            # Free a producer blocked on the full buffer so it can see the stop flag
+            while not buffer.empty():
+                buffer.get_nowait()
+    
+    async def synthesize_questions(self, question_texts: List[str]):
+        """Pre-synthesize question audio in the background after an interview is created"""
+        results = await asyncio.gather(
+            *(self.synthesize(text) for text in question_texts),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"Error synthesizing question audio: {result}")
+
+
+async def _iter_file(path: Path, chunk_size: int) -> AsyncIterator[bytes]:
+    with open(path, "rb") as f:
+        while True:
+            chunk = await run_in_threadpool(f.read, chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def _create_provider():
+    if settings.tts_provider == "fake":
+        return FakeTTSProvider(settings.tts_fake_bytes_per_second, settings.tts_stream_chunk_size)
+    return ElevenLabsProvider()
+
+
+tts_service = TTSService(
+    AudioCache(
+        settings.audio_cache_dir,
+        redis_ttl=settings.audio_cache_redis_ttl,
+        redis_max_bytes=settings.audio_cache_redis_max_bytes
+    ),
+    _create_provider()
+)
@@ -0,0 +1,29 @@
+import asyncio
+from celery import Celery
+from .config import settings
+from .evaluations import evaluate_stored_response
+
+celery_app = Celery("interviewer", broker=settings.celery_broker_url or settings.redis_url)
+celery_app.conf.update(
+    task_acks_late=True,
+    worker_prefetch_multiplier=1
+)
+
+# One event loop per worker process so the pooled AI client is reused across tasks
+_loop = None
+
+
+def _run(coro):
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coro)
+
+
+@celery_app.task(name="interviews.evaluate_response", bind=True, max_retries=3, default_retry_delay=5)
+def evaluate_response_task(self, response_id: int):
+    """Evaluate a pending response on the worker pool"""
+    try:
+        _run(evaluate_stored_response(response_id))
+    except Exception as e:
+        raise self.retry(exc=e)
@@ -0,0 +1,323 @@
+"""Load test for the interview flow: create -> start -> respond x N -> feedback
+
+Runs the FastAPI app in process against SQLite (default) or a local Postgres,
+with OpenAI replaced by a fake backend whose latency follows a configurable
+distribution. Prints per-endpoint throughput and latency percentiles as JSON.
+
+    cd backend
+    python -m benchmarks.flow_benchmark --candidates 50 --flows 2 --llm-latency lognormal:800,0.5 --output after.json
+    python -m benchmarks.flow_benchmark --compare before.json after.json --max-regression 10
+
+Latency distributions (milliseconds): fixed:MS, uniform:LOW,HIGH, lognormal:MEDIAN,SIGMA.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+ENDPOINTS = ("create", "start", "respond", "feedback")
+PERCENTILES = (50, 95, 99)
+
+ANSWER = (
+    "In my last role our checkout service kept timing out under load. I profiled it, found an N+1 query, "
+    "batched the lookups and added an index, which cut p95 latency from 2s to 200ms."
+)
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Turn a distribution spec into a sampler returning seconds"""
+    kind, _, params = spec.partition(":")
+    values = [float(v) for v in params.split(",") if v]
+    if kind == "fixed":
+        return lambda rng: values[0] / 1000
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1]) / 1000
+    if kind == "lognormal":
+        return lambda rng: rng.lognormvariate(math.log(values[0]), values[1]) / 1000
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def fake_llm_transport(latency: Callable[[random.Random], float], error_rate: float, seed: int):
+    """httpx transport answering chat completions the way the prompts in ai_service expect"""
+    import httpx
+
+    rng = random.Random(seed)
+    questions = [
+        {"question_text": f"Question {i}?", "question_type": "behavioral" if i <= 3 else "technical", "order_index": i}
+        for i in range(1, 9)
+    ]
+    evaluation = {"score": 7, "feedback": "Solid, specific answer.", "suggestions": ["Quantify the impact"]}
+    feedback = {
+        "overall_score": 7.5,
+        "summary": "Consistent answers with good examples.",
+        "strengths": ["Structure"],
+        "improvements": ["Depth"],
+        "recommendations": ["Practice system design"]
+    }
+
+    def sse_chunk(model: str, text: str) -> bytes:
+        chunk = {
+            "id": "fake",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": model,
+            "choices": [{"index": 0, "delta": {"content": text}, "finish_reason": None}]
+        }
+        return f"data: {json.dumps(chunk)}\n\n".encode()
+
+    async def stream_body(model: str, content: str, seconds: float):
+        # The sampled latency is spread over the stream, like tokens arriving over a completion
+        pieces = [content[i:i + 16] for i in range(0, len(content), 16)]
+        for piece in pieces:
+            await asyncio.sleep(seconds / len(pieces))
+            yield sse_chunk(model, piece)
+        yield b"data: [DONE]\n\n"
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        seconds = latency(rng)
+        if not body.get("stream"):
+            await asyncio.sleep(seconds)
+        if rng.random() < error_rate:
+            return httpx.Response(500, json={"error": {"message": "fake upstream error", "type": "server_error"}})
+
+        prompt = body["messages"][-1]["content"]
+        if "generate a mock interview" in prompt:
+            content = json.dumps(questions)
+        elif "evaluate this response" in prompt:
+            content = json.dumps(evaluation)
+        else:
+            content = json.dumps(feedback)
+        if body.get("stream"):
+            return httpx.Response(
+                200, content=stream_body(body["model"], content, seconds), headers={"content-type": "text/event-stream"}
+            )
+        return httpx.Response(200, json={
+            "id": "fake",
+            "object": "chat.completion",
+            "created": 0,
+            "model": body["model"],
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4, "total_tokens": (len(prompt) + len(content)) // 4}
+        })
+
+    return httpx.MockTransport(handler)
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {name: [] for name in ENDPOINTS}
+        self.errors: Dict[str, int] = {name: 0 for name in ENDPOINTS}
+
+    async def call(self, endpoint: str, request) -> Any:
+        start = time.perf_counter()
+        response = await request
+        self.latencies[endpoint].append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            self.errors[endpoint] += 1
+        return response
+
+
+async def run_flow(client, recorder: Recorder, candidate: int, flow: int, postings: int, feedback_poll: float):
+    posting = (candidate * 7919 + flow) % postings
+    response = await recorder.call("create", client.post("/api/interviews/create", json={
+        "job_title": f"Backend Engineer {posting}",
+        "job_description": f"Posting {posting}: build Python APIs with FastAPI and PostgreSQL."
+    }))
+    if response.status_code != 200:
+        return False
+    interview_id = response.json()["id"]
+
+    response = await recorder.call("start", client.post(f"/api/interviews/{interview_id}/start"))
+    if response.status_code != 200:
+        return False
+    question_id = response.json()["question_id"]
+
+    while question_id:
+        response = await recorder.call("respond", client.post(
+            f"/api/interviews/{interview_id}/respond",
+            json={"question_id": question_id, "response_text": ANSWER}
+        ))
+        if response.status_code != 200:
+            return False
+        question_id = response.json()["next_question_id"]
+
+    # With background evaluation, feedback is refused (409) until every answer is scored
+    while True:
+        response = await recorder.call("feedback", client.get(f"/api/interviews/{interview_id}/feedback"))
+        if response.status_code != 409:
+            return response.status_code == 200
+        recorder.errors["feedback"] -= 1
+        await asyncio.sleep(feedback_poll)
+
+
+def summarize(values: List[float], errors: int, duration: float) -> Dict[str, Any]:
+    import numpy as np
+
+    if not values:
+        return {"count": 0, "errors": errors}
+    ms = np.asarray(values) * 1000
+    summary = {
+        "count": len(values),
+        "errors": errors,
+        "throughput_rps": round(len(values) / duration, 2),
+        "mean_ms": round(float(ms.mean()), 2),
+        "max_ms": round(float(ms.max()), 2)
+    }
+    for p in PERCENTILES:
+        summary[f"p{p}_ms"] = round(float(np.percentile(ms, p)), 2)
+    return summary
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def configure_environment(args):
+    """Settings are read at import time, so the environment is set before the app is imported"""
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["OPENAI_ENABLED"] = "true"
+    os.environ["EVALUATION_MODE"] = args.evaluation_mode
+    os.environ["QUESTION_STREAMING"] = "true" if args.question_streaming else "false"
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    os.environ.setdefault("REDIS_URL", "")
+    os.environ.setdefault("TTS_ENABLED", "false")
+    # Measure the flow rather than the caches and the client-side limits
+    os.environ.setdefault("QUESTION_BANK_ENABLED", "false")
+    os.environ.setdefault("LLM_RPM_LIMIT", "1000000")
+    os.environ.setdefault("LLM_TPM_LIMIT", "1000000000")
+    os.environ.setdefault("LLM_MAX_CONCURRENCY", "10000")
+
+
+async def benchmark(args) -> Dict[str, Any]:
+    configure_environment(args)
+
+    import httpx
+    import openai
+    from app.ai_service import get_ai_service
+    from app.database import Base, engine
+    from app.main import app
+
+    Base.metadata.create_all(bind=engine)
+    ai_service = get_ai_service()
+    ai_service.client = openai.AsyncOpenAI(
+        api_key="benchmark",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=fake_llm_transport(parse_latency(args.llm_latency), args.llm_error_rate, args.seed))
+    )
+
+    recorder = Recorder()
+    completed = 0
+
+    async def candidate(client, index: int):
+        nonlocal completed
+        for flow in range(args.flows):
+            if await run_flow(client, recorder, index, flow, args.postings, args.feedback_poll):
+                completed += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        if args.warmup:
+            await run_flow(client, Recorder(), -1, 0, args.postings, args.feedback_poll)
+        start = time.perf_counter()
+        await asyncio.gather(*(candidate(client, i) for i in range(args.candidates)))
+        duration = time.perf_counter() - start
+
+    await ai_service.aclose()
+    total_requests = sum(len(v) for v in recorder.latencies.values())
+    return {
+        "commit": git_commit(),
+        "config": {
+            "candidates": args.candidates,
+            "flows_per_candidate": args.flows,
+            "postings": args.postings,
+            "database": engine.url.get_backend_name(),
+            "evaluation_mode": args.evaluation_mode,
+            "question_streaming": args.question_streaming,
+            "llm_latency": args.llm_latency,
+            "llm_error_rate": args.llm_error_rate,
+            "seed": args.seed
+        },
+        "duration_seconds": round(duration, 3),
+        "flows_completed": completed,
+        "flows_per_second": round(completed / duration, 2),
+        "requests_per_second": round(total_requests / duration, 2),
+        "endpoints": {
+            name: summarize(recorder.latencies[name], recorder.errors[name], duration)
+            for name in ENDPOINTS
+        }
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], max_regression: float) -> bool:
+    """Print percentile changes per endpoint; False if any grew by more than max_regression percent"""
+    ok = True
+    print(f"{'endpoint':<10} {'metric':<8} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name in ENDPOINTS:
+        before = baseline["endpoints"].get(name, {})
+        after = current["endpoints"].get(name, {})
+        for p in PERCENTILES:
+            key = f"p{p}_ms"
+            if key not in before or key not in after:
+                continue
+            change = (after[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+            flag = ""
+            if change > max_regression:
+                ok = False
+                flag = "  REGRESSION"
+            print(f"{name:<10} {key:<8} {before[key]:>10.2f} {after[key]:>10.2f} {change:>7.1f}%{flag}")
+    return ok
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=20, help="concurrent simulated candidates")
+    parser.add_argument("--flows", type=int, default=1, help="interviews completed by each candidate")
+    parser.add_argument("--postings", type=int, default=1000, help="distinct job postings to draw from")
+    parser.add_argument("--database-url", default=None, help="defaults to a fresh SQLite file")
+    parser.add_argument("--evaluation-mode", default="inline", choices=("inline", "background"))
+    parser.add_argument("--question-streaming", action=argparse.BooleanOptionalAction, default=True)
+    parser.add_argument("--llm-latency", default="lognormal:800,0.4")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--feedback-poll", type=float, default=0.05, help="seconds between feedback retries")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--warmup", action="store_true", help="run one untimed flow first")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), help="compare two reports")
+    parser.add_argument("--max-regression", type=float, default=10.0, help="percent, used with --compare")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+        return 0 if compare(baseline, current, args.max_regression) else 1
+
+    if args.database_url is None:
+        directory = tempfile.mkdtemp(prefix="interviewer-benchmark-")
+        args.database_url = f"sqlite:///{os.path.join(directory, 'benchmark.db')}"
+
+    report = json.dumps(asyncio.run(benchmark(args)), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
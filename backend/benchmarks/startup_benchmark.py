@@ -0,0 +1,99 @@
+"""Cold-start benchmark: how long a fresh worker takes to import the app and serve /health
+
+Each run starts a new interpreter, so nothing is shared between runs. By default
+the database URL points at a path that does not exist and table creation is
+disabled, which also checks that startup never touches the database.
+
+    cd backend
+    python -m benchmarks.startup_benchmark --runs 10 --max-ready-seconds 1.0
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Any, Dict, List, Optional
+
+IMPORT_PROBE = "import time; start = time.perf_counter(); import app.main; print(time.perf_counter() - start)"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_import(env: Dict[str, str]) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def measure_ready(env: Dict[str, str], timeout: float) -> float:
+    """Seconds from spawning uvicorn until /health answers"""
+    port = free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited early: {process.stderr.read().decode()[-2000:]}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=0.5) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.005)
+        raise RuntimeError(f"/health did not answer within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def summarize(values: List[float]) -> Dict[str, Any]:
+    ordered = sorted(values)
+    return {
+        "runs": len(ordered),
+        "min_seconds": round(ordered[0], 3),
+        "p50_seconds": round(ordered[len(ordered) // 2], 3),
+        "max_seconds": round(ordered[-1], 3)
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--database-url", default="sqlite:////nonexistent/interviewer.db")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--max-ready-seconds", type=float, help="exit non-zero if the median exceeds this")
+    args = parser.parse_args(argv)
+
+    env = {
+        **os.environ,
+        "DATABASE_URL": args.database_url,
+        "CREATE_TABLES_ON_STARTUP": "false",
+        "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "benchmark"),
+        "REDIS_URL": os.environ.get("REDIS_URL", "")
+    }
+
+    imports = [measure_import(env) for _ in range(args.runs)]
+    ready = [measure_ready(env, args.timeout) for _ in range(args.runs)]
+    report = {"import": summarize(imports), "ready": summarize(ready)}
+    print(json.dumps(report, indent=2))
+
+    if args.max_ready_seconds is not None and report["ready"]["p50_seconds"] > args.max_ready_seconds:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,22 @@
+import os
+import tempfile
+import pytest
+
+# Settings are read when app modules are imported: keep the tests off PostgreSQL, Redis and OpenAI
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'interviewer-tests.db')}")
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("OPENAI_ENABLED", "false")
+os.environ["REDIS_URL"] = ""
+os.environ.setdefault("PRESCORE_WORKERS", "0")
+
+
+@pytest.fixture
+def tables():
+    """A fresh schema on the test database"""
+    from app import models  # noqa: F401
+    from app.database import Base, engine
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield
+    Base.metadata.drop_all(engine)
@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app import crud, database
+from app.database import _async_database_url, open_session
+
+
+@pytest.fixture
+def async_engine(tables, monkeypatch):
+    """Route open_session through the async engine, as DB_ASYNC does; the test disposes of it"""
+    engine = create_async_engine(_async_database_url())
+    monkeypatch.setattr(database, "AsyncSessionLocal", async_sessionmaker(engine, autoflush=False, expire_on_commit=False))
+    return engine
+
+
+def test_async_url_uses_an_async_driver():
+    assert _async_database_url().startswith("sqlite+aiosqlite://")
+
+
+@pytest.mark.asyncio
+async def test_session_runner_on_the_async_engine(async_engine):
+    try:
+        questions = [{"question_text": "Why us?", "question_type": "behavioral", "order_index": 1}]
+        async with open_session() as db:
+            assert isinstance(db.session, AsyncSession)
+            interview = await db.run(
+                crud.create_interview_with_questions, 1, {"job_title": "Backend Engineer", "job_description": "Python"}, questions
+            )
+            await db.commit()
+
+        async with open_session() as db:
+            question = await db.run(crud.get_question, interview["id"], interview["questions"][0]["id"])
+            response_id = await db.run(
+                crud.save_response, interview["id"], {"id": question.id, "question_type": "behavioral", "order_index": 1},
+                "Because of the product.", {"feedback": "Good", "suggestions": [], "score": 7.0}, "completed", True
+            )
+            evaluations = await db.run(crud.get_response_evaluations, interview["id"])
+        assert [(e["id"], e["evaluation_status"], e["score"]) for e in evaluations] == [(response_id, "completed", 7.0)]
+    finally:
+        await async_engine.dispose()
@@ -0,0 +1,73 @@
+from datetime import datetime, timezone
+from app import crud
+from app.database import SessionLocal
+from app.evaluations import _store_completed_evaluation
+from app.export import iter_interview_batches
+from app.models import Interview, Question, Response
+
+OLD = datetime(2026, 1, 1, tzinfo=timezone.utc)
+WATERMARK = datetime(2026, 2, 1, tzinfo=timezone.utc)
+CUTOFF = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+def add_interview(db, title, updated_at, response_updated_at=None):
+    interview = Interview(user_id=1, job_title=title, job_description="", status="in_progress", updated_at=updated_at)
+    db.add(interview)
+    db.flush()
+    question = Question(interview_id=interview.id, question_text="Why?", question_type="behavioral", order_index=1)
+    db.add(question)
+    db.flush()
+    if response_updated_at is not None:
+        db.add(Response(
+            interview_id=interview.id,
+            question_id=question.id,
+            response_text="Because",
+            evaluation_status="pending",
+            updated_at=response_updated_at
+        ))
+    db.commit()
+    return interview.id
+
+
+def exported_titles(db, **filters):
+    return [i["job_title"] for batch in iter_interview_batches(db, **filters) for i in batch]
+
+
+def test_incremental_export_selects_changes_in_the_window(tables):
+    db = SessionLocal()
+    try:
+        add_interview(db, "unchanged", OLD, OLD)
+        add_interview(db, "interview changed", datetime(2026, 2, 15, tzinfo=timezone.utc))
+        add_interview(db, "response changed", OLD, datetime(2026, 2, 15, tzinfo=timezone.utc))
+        add_interview(db, "too recent", datetime(2026, 3, 15, tzinfo=timezone.utc))
+
+        assert exported_titles(db, after=WATERMARK, until=CUTOFF) == ["interview changed", "response changed"]
+        assert len(exported_titles(db)) == 4
+        assert len(exported_titles(db, created_from=datetime(2000, 1, 1))) == 4
+    finally:
+        db.close()
+
+
+def test_writes_bump_updated_at(tables):
+    db = SessionLocal()
+    try:
+        interview_id = add_interview(db, "answered", OLD)
+        question = {"id": db.query(Question.id).filter(Question.interview_id == interview_id).scalar(),
+                    "question_type": "behavioral", "order_index": 1}
+        response_id = crud.save_response(
+            db, interview_id, question, "Because", {"feedback": "", "suggestions": [], "score": None}, "pending", False
+        )
+        assert exported_titles(db, after=WATERMARK) == ["answered"]
+
+        db.query(Response).filter(Response.id == response_id).update({"updated_at": OLD}, synchronize_session=False)
+        db.commit()
+        assert exported_titles(db, after=WATERMARK) == []
+
+        _store_completed_evaluation(
+            db, response_id, {"interview_id": interview_id, "question_type": "behavioral", "order_index": 1},
+            {"feedback": "Good", "score": 7.0, "suggestions": []}
+        )
+        assert exported_titles(db, after=WATERMARK) == ["answered"]
+        assert db.query(Interview.updated_at).filter(Interview.id == interview_id).scalar() > OLD.replace(tzinfo=None)
+    finally:
+        db.close()
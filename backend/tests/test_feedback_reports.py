@@ -0,0 +1,71 @@
+import pytest
+from app.ai_service import AIService
+from app.config import settings
+from app.database import SessionLocal, open_session
+from app.models import FeedbackReport, Interview, Question, Response
+from app.routers.interviews import get_interview_feedback
+
+REAL_FEEDBACK = {
+    "overall_score": 8.5,
+    "summary": "Strong, specific answers.",
+    "strengths": ["Concrete examples"],
+    "improvements": ["Quantify results"],
+    "recommendations": ["Practice system design"]
+}
+
+
+def completed_interview() -> int:
+    db = SessionLocal()
+    try:
+        interview = Interview(user_id=1, job_title="Backend Engineer", job_description="Python", status="completed")
+        db.add(interview)
+        db.flush()
+        question = Question(interview_id=interview.id, question_text="Why us?", question_type="behavioral", order_index=1)
+        db.add(question)
+        db.flush()
+        db.add(Response(
+            interview_id=interview.id,
+            question_id=question.id,
+            response_text="Because of the product.",
+            ai_feedback="Fine",
+            suggestions=[],
+            score=7.0,
+            evaluation_status="completed"
+        ))
+        db.commit()
+        return interview.id
+    finally:
+        db.close()
+
+
+def stored_reports() -> int:
+    db = SessionLocal()
+    try:
+        return db.query(FeedbackReport).count()
+    finally:
+        db.close()
+
+
+@pytest.mark.asyncio
+async def test_placeholder_report_is_regenerated_once_openai_is_enabled(tables, monkeypatch):
+    interview_id = completed_interview()
+    monkeypatch.setattr(settings, "openai_enabled", False)
+    async with open_session() as db:
+        placeholder = await get_interview_feedback(interview_id, db)
+    assert placeholder.feedback_summary == AIService._placeholder_feedback()["summary"]
+    assert stored_reports() == 0
+
+    async def generate_interview_feedback(self, interview_data):
+        return REAL_FEEDBACK
+
+    monkeypatch.setattr(settings, "openai_enabled", True)
+    monkeypatch.setattr(AIService, "generate_interview_feedback", generate_interview_feedback)
+    async with open_session() as db:
+        feedback = await get_interview_feedback(interview_id, db)
+    assert feedback.feedback_summary == REAL_FEEDBACK["summary"]
+    assert stored_reports() == 1
+
+    # Served from the stored report from now on
+    monkeypatch.setattr(AIService, "generate_interview_feedback", None)
+    async with open_session() as db:
+        assert (await get_interview_feedback(interview_id, db)).overall_score == 8.5
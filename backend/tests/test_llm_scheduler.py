@@ -0,0 +1,143 @@
+import asyncio
+import pytest
+from app.llm_scheduler import LLMScheduler, Priority, TokenBucket, estimate_tokens
+
+
+def make_scheduler(rpm=6000, tpm=1_000_000, max_concurrency=1):
+    return LLMScheduler(rpm=rpm, tpm=tpm, max_concurrency=max_concurrency, backoff=0.05, backoff_max=1.0)
+
+
+class TestTokenBucket:
+    def test_starts_full(self):
+        bucket = TokenBucket(60)
+        assert bucket.wait_time(60, bucket.updated, 1.0) == 0.0
+
+    def test_wait_for_the_missing_amount(self):
+        bucket = TokenBucket(60)  # refills one per second
+        bucket.consume(60)
+        assert bucket.wait_time(3, bucket.updated, 1.0) == pytest.approx(3.0)
+        # Half the rate takes twice as long
+        assert bucket.wait_time(3, bucket.updated, 0.5) == pytest.approx(6.0)
+
+    def test_refills_over_time_up_to_capacity(self):
+        bucket = TokenBucket(60)
+        bucket.consume(60)
+        now = bucket.updated
+        assert bucket.wait_time(2, now + 2, 1.0) == 0.0
+        bucket.wait_time(0, now + 1000, 1.0)
+        assert bucket.tokens == 60
+
+    def test_overdraft_and_refund(self):
+        bucket = TokenBucket(60)
+        bucket.consume(100)
+        assert bucket.tokens == -40
+        bucket.refund(500)
+        assert bucket.tokens == 60
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("a" * 40, "b" * 8) == 10 + 4 + 2 + 4
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_is_served_first():
+    scheduler = make_scheduler()
+    order = []
+    release = asyncio.Event()
+
+    async def call(name, priority):
+        async with scheduler.slot(priority, 10):
+            order.append(name)
+            if name == "first":
+                await release.wait()
+
+    first = asyncio.create_task(call("first", Priority.STANDARD))
+    await asyncio.sleep(0)
+    queued = [
+        asyncio.create_task(call("bulk", Priority.BULK)),
+        asyncio.create_task(call("standard", Priority.STANDARD)),
+        asyncio.create_task(call("interactive", Priority.INTERACTIVE)),
+    ]
+    await asyncio.sleep(0.01)
+    assert order == ["first"]
+    assert scheduler.snapshot()["queued"] == 3
+
+    release.set()
+    await asyncio.gather(first, *queued)
+    assert order == ["first", "interactive", "standard", "bulk"]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit():
+    scheduler = make_scheduler(max_concurrency=2)
+    running = peak = 0
+
+    async def call():
+        nonlocal running, peak
+        async with scheduler.slot(Priority.STANDARD, 10):
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(call() for _ in range(6)))
+    assert peak == 2
+    assert scheduler.stats["granted"] == 6
+    assert scheduler.snapshot()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_token_budget_delays_admission():
+    scheduler = make_scheduler(tpm=600, max_concurrency=10)  # 10 tokens a second
+    async with scheduler.slot(Priority.STANDARD, 600):
+        pass
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    async with scheduler.slot(Priority.STANDARD, 2):
+        pass
+    assert loop.time() - started == pytest.approx(0.2, abs=0.1)
+
+
+@pytest.mark.asyncio
+async def test_used_tokens_are_reconciled():
+    scheduler = make_scheduler(tpm=1000)
+    async with scheduler.slot(Priority.STANDARD, 400) as grant:
+        grant.used_tokens = 100
+    assert scheduler.tokens.tokens == pytest.approx(900, abs=1)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_is_dropped():
+    scheduler = make_scheduler()
+    release = asyncio.Event()
+
+    async def hold():
+        async with scheduler.slot(Priority.STANDARD, 10):
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    release.set()
+    await holder
+    assert scheduler.snapshot()["queued"] == 0
+    assert scheduler.snapshot()["in_flight"] == 0
+    assert scheduler.stats["granted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_pauses_and_slows_admissions():
+    scheduler = make_scheduler()
+    scheduler.on_rate_limited(retry_after=0.1)
+    assert scheduler.snapshot()["rate_factor"] == 0.5
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    async with scheduler.slot(Priority.INTERACTIVE, 10):
+        pass
+    assert loop.time() - started >= 0.09
+    # Recovers gradually as calls succeed
+    assert scheduler.snapshot()["rate_factor"] == 0.55
@@ -0,0 +1,48 @@
+from app.prescorer import insufficient_evaluation, score_batch
+
+THRESHOLDS = {"min_words": 8, "min_alpha_ratio": 0.6, "min_unique_ratio": 0.2, "repetitive_min_words": 20}
+
+QUESTION = "Tell me about a time you improved the performance of a database query."
+GOOD_ANSWER = (
+    "In my previous role the reporting database was slow, and my task was to cut the dashboard load time "
+    "before a client deadline. I analyzed the query plans, so I added a composite index and rewrote two "
+    "correlated subqueries as joins. As a result the load time dropped from 12 seconds to 800 ms, a 93% reduction."
+)
+
+
+def test_thin_answers_are_flagged():
+    results = score_batch([
+        (QUESTION, "I would optimize it.", ""),
+        (QUESTION, "1024 2048 4096 8192 16384 32768 65536 131072 262144 524288", ""),
+        (QUESTION, " ".join(["database"] * 30), ""),
+    ], THRESHOLDS)
+    assert [r["reasons"] for r in results] == [["too_short"], ["not_text"], ["repetitive"]]
+    assert all(r["insufficient"] and r["score"] <= 2.0 for r in results)
+
+
+def test_short_repetition_is_left_to_the_repetitive_minimum():
+    answer = " ".join(["query"] * 10)
+    assert score_batch([(QUESTION, answer, "")], THRESHOLDS)[0]["reasons"] == []
+    lowered = {**THRESHOLDS, "repetitive_min_words": 10}
+    assert score_batch([(QUESTION, answer, "")], lowered)[0]["reasons"] == ["repetitive"]
+
+
+def test_substantive_answer_scores_higher():
+    weak, strong = score_batch([
+        (QUESTION, "I think I would look at the query and try to make it faster somehow.", ""),
+        (QUESTION, GOOD_ANSWER, "database performance"),
+    ], THRESHOLDS)
+    assert not strong["insufficient"]
+    assert strong["score"] > weak["score"]
+    assert 1.0 <= weak["score"] <= strong["score"] <= 10.0
+
+
+def test_empty_batch():
+    assert score_batch([], THRESHOLDS) == []
+
+
+def test_insufficient_evaluation_explains_each_reason():
+    evaluation = insufficient_evaluation({"score": 1.5, "insufficient": True, "reasons": ["too_short", "not_text"]})
+    assert evaluation["score"] == 1.5
+    assert "too short" in evaluation["feedback"] and "prose" in evaluation["feedback"]
+    assert evaluation["suggestions"]
@@ -0,0 +1,94 @@
+import asyncio
+import pytest
+from app.singleflight import SingleFlight
+
+
+def make_flight():
+    return SingleFlight("test", lock_ttl=10, result_ttl=10, wait_timeout=5, poll_interval=0.01)
+
+
+def slow_call(result, delay=0.05):
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return fn, calls
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flight = make_flight()
+    fn, calls = slow_call({"questions": [1, 2]})
+    results = await asyncio.gather(*(flight.do("key", fn) for _ in range(5)))
+    assert results == [{"questions": [1, 2]}] * 5
+    assert len(calls) == 1
+    assert flight.stats["coalesced_local"] == 4
+    assert flight._calls == {}
+
+
+@pytest.mark.asyncio
+async def test_different_keys_run_separately():
+    flight = make_flight()
+    fn, calls = slow_call("ok")
+    await asyncio.gather(flight.do("a", fn), flight.do("b", fn))
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_later_call_runs_again():
+    flight = make_flight()
+    fn, calls = slow_call("ok", delay=0)
+    await flight.do("key", fn)
+    await flight.do("key", fn)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_error_reaches_every_caller():
+    flight = make_flight()
+    fn, calls = slow_call(RuntimeError("no questions"))
+    results = await asyncio.gather(flight.do("key", fn), flight.do("key", fn), return_exceptions=True)
+    assert [str(r) for r in results] == ["no questions", "no questions"]
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_followers():
+    flight = make_flight()
+    fn, calls = slow_call("ok", delay=0.1)
+    leader = asyncio.create_task(flight.do("key", fn))
+    await asyncio.sleep(0.01)
+    follower = asyncio.create_task(flight.do("key", fn))
+    await asyncio.sleep(0.01)
+
+    leader.cancel()
+    assert await follower == "ok"
+    assert leader.cancelled()
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_call_is_cancelled_once_every_caller_gave_up():
+    flight = make_flight()
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def fn():
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    callers = [asyncio.create_task(flight.do("key", fn)) for _ in range(2)]
+    await started.wait()
+    for caller in callers:
+        caller.cancel()
+    await asyncio.wait_for(cancelled.wait(), 1)
+    await asyncio.sleep(0)
+    assert flight._calls == {}
@@ -0,0 +1,83 @@
+from app.ai_service import JSONArrayStream, parse_partial_json
+
+
+def feed_in_chunks(text, size):
+    parser = JSONArrayStream()
+    items = []
+    for start in range(0, len(text), size):
+        items.extend(parser.feed(text[start:start + size]))
+    return items
+
+
+class TestParsePartialJSON:
+    def test_complete_document(self):
+        assert parse_partial_json('{"overall_score": 7, "summary": "ok"}') == {"overall_score": 7, "summary": "ok"}
+
+    def test_closes_open_string_array_and_object(self):
+        assert parse_partial_json('{"summary": "Good an') == {"summary": "Good an"}
+        assert parse_partial_json('{"strengths": ["clear", "conc') == {"strengths": ["clear", "conc"]}
+
+    def test_trailing_comma(self):
+        assert parse_partial_json('{"overall_score": 7,') == {"overall_score": 7}
+
+    def test_holds_back_a_number_that_may_continue(self):
+        assert parse_partial_json('{"overall_score": 1') is None
+        assert parse_partial_json('{"scores": [7, 1') is None
+        assert parse_partial_json('{"overall_score": 1.5e') is None
+
+    def test_number_followed_by_whitespace_is_complete(self):
+        assert parse_partial_json('{"overall_score": 10 ') == {"overall_score": 10}
+
+    def test_digits_inside_a_string(self):
+        assert parse_partial_json('{"summary": "scored 1') == {"summary": "scored 1"}
+
+    def test_incomplete_key(self):
+        assert parse_partial_json('{"overall_sc') is None
+        assert parse_partial_json('{"overall_score":') is None
+
+    def test_escape_at_the_end(self):
+        assert parse_partial_json('{"summary": "a \\') == {"summary": "a "}
+
+    def test_skips_text_before_the_object(self):
+        assert parse_partial_json('```json\n{"a": "b"') == {"a": "b"}
+
+    def test_no_object(self):
+        assert parse_partial_json("") is None
+        assert parse_partial_json("Sure, here is the feedback") is None
+
+
+class TestJSONArrayStream:
+    QUESTIONS = '[{"question_text": "Why [this] role?"}, {"question_text": "Say \\"hi\\"", "tags": [1, 2]}]'
+
+    def test_elements_in_any_chunking(self):
+        expected = [{"question_text": "Why [this] role?"}, {"question_text": 'Say "hi"', "tags": [1, 2]}]
+        for size in (1, 2, 7, len(self.QUESTIONS)):
+            assert feed_in_chunks(self.QUESTIONS, size) == expected
+
+    def test_element_is_returned_once_it_closes(self):
+        parser = JSONArrayStream()
+        assert parser.feed('[{"question_text": "a"') == []
+        assert parser.feed('}, {"question_text"') == [{"question_text": "a"}]
+        assert parser.feed(': "b"}]') == [{"question_text": "b"}]
+
+    def test_markdown_fence_and_wrapping_object(self):
+        text = '```json\n{"questions": [{"question_text": "a"}]}\n```'
+        assert feed_in_chunks(text, 3) == [{"question_text": "a"}]
+
+    def test_skips_arrays_that_do_not_hold_objects(self):
+        text = '{"skills": ["python", "[sql]"], "levels": [], "questions": [ {"question_text": "a"}]}'
+        assert feed_in_chunks(text, 4) == [{"question_text": "a"}]
+
+    def test_nested_array(self):
+        assert feed_in_chunks('[[{"a": 1}, {"b": 2}]]', 3) == [{"a": 1}, {"b": 2}]
+
+    def test_array_without_objects(self):
+        assert feed_in_chunks("[1, 2, 3]", 2) == []
+
+    def test_stops_after_the_array(self):
+        parser = JSONArrayStream()
+        assert parser.feed('[{"a": 1}] [{"b": 2}]') == [{"a": 1}]
+        assert parser.feed('[{"c": 3}]') == []
+
+    def test_malformed_element_is_skipped(self):
+        assert feed_in_chunks('[{"a": 1,}, {"b": 2}]', 5) == [{"b": 2}]
@@ -0,0 +1,88 @@
+import asyncio
+import threading
+import pytest
+from app.tts_service import AudioCache, TTSService
+
+
+class BlockingProvider:
+    """Emits audio once released, counting the syntheses it was asked for"""
+
+    def __init__(self, error=None):
+        self.release = threading.Event()
+        self.calls = 0
+        self.error = error
+
+    def stream(self, text):
+        self.calls += 1
+        self.release.wait(5)
+        if self.error:
+            raise self.error
+        yield f"audio:{text}".encode()
+
+
+def make_service(tmp_path, provider):
+    return TTSService(AudioCache(str(tmp_path), redis_ttl=60, redis_max_bytes=1024), provider)
+
+
+async def started(service, count=1):
+    while len(service._in_flight) < count:
+        await asyncio.sleep(0.001)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_synthesis(tmp_path):
+    provider = BlockingProvider()
+    service = make_service(tmp_path, provider)
+    callers = [asyncio.create_task(service.synthesize("Why us?")) for _ in range(3)]
+    await started(service)
+    provider.release.set()
+    paths = await asyncio.gather(*callers)
+    assert len(set(paths)) == 1
+    assert paths[0].read_bytes() == b"audio:Why us?"
+    assert provider.calls == 1
+    assert service._in_flight == {}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_strand_followers(tmp_path):
+    provider = BlockingProvider()
+    service = make_service(tmp_path, provider)
+    leader = asyncio.create_task(service.synthesize("Why us?"))
+    await started(service)
+    follower = asyncio.create_task(service.synthesize("Why us?"))
+    await asyncio.sleep(0.01)
+
+    leader.cancel()
+    await asyncio.sleep(0.01)
+    provider.release.set()
+    path = await asyncio.wait_for(follower, 5)
+    assert path.read_bytes() == b"audio:Why us?"
+    assert leader.cancelled()
+    assert provider.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_synthesis_finishes_and_is_cached_after_every_caller_left(tmp_path):
+    provider = BlockingProvider()
+    service = make_service(tmp_path, provider)
+    caller = asyncio.create_task(service.synthesize("Why us?"))
+    await started(service)
+    caller.cancel()
+    provider.release.set()
+    await asyncio.wait_for(asyncio.gather(*service._in_flight.values()), 5)
+
+    await service.synthesize("Why us?")
+    assert provider.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_error_reaches_every_caller_and_is_not_cached(tmp_path):
+    provider = BlockingProvider(error=RuntimeError("quota exceeded"))
+    service = make_service(tmp_path, provider)
+    callers = [asyncio.create_task(service.synthesize("Why us?")) for _ in range(2)]
+    await started(service)
+    provider.release.set()
+    results = await asyncio.gather(*callers, return_exceptions=True)
+    assert [str(r) for r in results] == ["quota exceeded", "quota exceeded"]
+    assert service._in_flight == {}
+    assert await service.cache.get_path(service.cache_key("Why us?")) is None